@@ -1,3 +1,4 @@
+import functools
 import os
 import pathlib
 import platform
@@ -63,6 +64,8 @@ class Config:
     MAX_IMAGE_CACHE_SIZE_MB = 200
     MAX_BOOSTER_CACHE_SIZE_MB = 50
     AUTO_SAVE_INTERVAL = 300000
+    LOG_FLUSH_INTERVAL_MS = 30000
+    SPLASH_MIN_STARTUP_MS = 400
     PROJECT_EXTENSION = 'mtgproj'
     MAX_RECENT_PROJECTS = 5
     DEFAULT_THEME = 'dark'
@@ -151,12 +154,14 @@ verify_cache_accessibility()
 class ThemeManager:
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_dark_stylesheet():
         stylesheet = "\n        QWidget {\n            background-color: #2b2b2b;\n            color: #f0f0f0;\n            font-family: " + Config.SYSTEM_FONT + ";\n            font-size: 10pt;\n        }"
         stylesheet += "\n        QMainWindow, QTabWidget, QSplitter {\n            background-color: #2b2b2b;\n        }\n        QTabWidget::pane { border: 1px solid #444; border-top: 0px; }\n        QTabBar::tab { \n            background: #3c3f41; \n            border: 1px solid #444; \n            border-bottom: none; \n            padding: 8px 20px; \n            border-top-left-radius: 4px; \n            border-top-right-radius: 4px; \n        }\n        QTabBar::tab:selected { background: #2b2b2b; margin-bottom: -1px; }\n        QTabBar::tab:!selected:hover { background: #4f5355; }\n        QGroupBox { \n            font-weight: bold; \n            border: 1px solid #444; \n            border-radius: 5px; \n            margin-top: 1ex; \n        }\n        QGroupBox::title { \n            subcontrol-origin: margin; \n            subcontrol-position: top left; \n            padding: 0 3px; \n            font-size: 12pt; \n            font-weight: 600; \n        }\n        QLabel.subtitle { \n            font-size: 9pt; \n            color: #888; \n        }\n        QLabel.title { \n            font-size: 14pt; \n            font-weight: 700; \n        }\n        QPushButton { \n            background-color: #3c3f41; \n            border: 1px solid #555; \n            padding: 5px 10px; \n            border-radius: 4px; \n        }\n        QPushButton:hover { background-color: #4f5355; }\n        QPushButton:pressed { background-color: #2a2d2f; }\n        QPushButton#AccentButton { \n            background-color: #007acc; \n            color: white; \n            font-weight: bold; \n        }\n        QPushButton#AccentButton:hover { background-color: #008ae6; }\n        QPushButton#BreadcrumbButton { \n            background-color: transparent; \n            border: none; \n            color: #00aaff; \n            text-align: left; \n            padding: 2px; \n        }\n        QPushButton#BreadcrumbButton:hover { text-decoration: underline; }\n        QLineEdit, QComboBox, QListWidget, QTreeWidget { \n            background-color: #3c3f41; \n            border: 1px solid #555; \n            border-radius: 4px; \n            padding: 3px; \n        }\n        QHeaderView::section { \n            background-color: #3c3f41; \n            border: 1px solid #555; \n            padding: 4px; \n        }\n        QProgressBar { \n            border: 1px solid #555; \n            border-radius: 4px; \n            text-align: center; \n        }\n        QProgressBar::chunk { \n            background-color: #007acc; \n            width: 10px; \n            margin: 0.5px; \n        }\n        #qt_toolbar_navigation { background-color: #2b2b2b; }\n        #qt_toolbar_navigation QToolButton { \n            background-color: #3c3f41; \n            border: 1px solid #555; \n            border-radius: 2px; \n            margin: 1px; \n        }\n        #qt_toolbar_navigation QToolButton:hover { background-color: #4f5355; }\n        QLabel#CardImageLabel { \n            background-color: #3c3f41; \n            border: 1px solid #555; \n            border-radius: 4px; \n        }\n        QStatusBar {\n            background-color: #2b2b2b;\n            border-top: 1px solid #444;\n            color: #f0f0f0;\n        }\n        QMenuBar {\n            background-color: #2b2b2b;\n            border-bottom: 1px solid #444;\n        }\n        QMenuBar::item {\n            background-color: transparent;\n            padding: 4px 8px;\n        }\n        QMenuBar::item:selected {\n            background-color: #3c3f41;\n        }\n        QMenu {\n            background-color: #3c3f41;\n            border: 1px solid #555;\n        }\n        QMenu::item {\n            padding: 5px 10px;\n        }\n        QMenu::item:selected {\n            background-color: #4f5355;\n        }\n        "
         return stylesheet
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_light_stylesheet():
         stylesheet = "\n        QWidget {\n            background-color: #ffffff;\n            color: #333333;\n            font-family: " + Config.SYSTEM_FONT + ";\n            font-size: 10pt;\n        }"
         stylesheet += "\n        QMainWindow, QTabWidget, QSplitter {\n            background-color: #ffffff;\n        }\n        QTabWidget::pane { border: 1px solid #cccccc; border-top: 0px; }\n        QTabBar::tab { \n            background: #f0f0f0; \n            border: 1px solid #cccccc; \n            border-bottom: none; \n            padding: 8px 20px; \n            border-top-left-radius: 4px; \n            border-top-right-radius: 4px; \n        }\n        QTabBar::tab:selected { background: #ffffff; margin-bottom: -1px; }\n        QTabBar::tab:!selected:hover { background: #e0e0e0; }\n        QGroupBox { \n            font-weight: bold; \n            border: 1px solid #cccccc; \n            border-radius: 5px; \n            margin-top: 1ex; \n        }\n        QGroupBox::title { \n            subcontrol-origin: margin; \n            subcontrol-position: top left; \n            padding: 0 3px; \n            font-size: 12pt; \n            font-weight: 600; \n        }\n        QLabel.subtitle { \n            font-size: 9pt; \n            color: #888; \n        }\n        QLabel.title { \n            font-size: 14pt; \n            font-weight: 700; \n        }\n        QPushButton { \n            background-color: #f0f0f0; \n            border: 1px solid #cccccc; \n            padding: 5px 10px; \n            border-radius: 4px; \n        }\n        QPushButton:hover { background-color: #e0e0e0; }\n        QPushButton:pressed { background-color: #d0d0d0; }\n        QPushButton#AccentButton { \n            background-color: #007acc; \n            color: white; \n            font-weight: bold; \n        }\n        QPushButton#AccentButton:hover { background-color: #005a99; }\n        QPushButton#BreadcrumbButton { \n            background-color: transparent; \n            border: none; \n            color: #007acc; \n            text-align: left; \n            padding: 2px; \n        }\n        QPushButton#BreadcrumbButton:hover { text-decoration: underline; }\n        QLineEdit, QComboBox, QListWidget, QTreeWidget { \n            background-color: #ffffff; \n            border: 1px solid #cccccc; \n            border-radius: 4px; \n            padding: 3px; \n        }\n        QHeaderView::section { \n            background-color: #f0f0f0; \n            border: 1px solid #cccccc; \n            padding: 4px; \n        }\n        QProgressBar { \n            border: 1px solid #cccccc; \n            border-radius: 4px; \n            text-align: center; \n        }\n        QProgressBar::chunk { \n            background-color: #007acc; \n            width: 10px; \n            margin: 0.5px; \n        }\n        #qt_toolbar_navigation { background-color: #f0f0f0; }\n        #qt_toolbar_navigation QToolButton { \n            background-color: #ffffff; \n            border: 1px solid #cccccc; \n            border-radius: 2px; \n            margin: 1px; \n        }\n        #qt_toolbar_navigation QToolButton:hover { background-color: #e0e0e0; }\n        QLabel#CardImageLabel { \n            background-color: #ffffff; \n            border: 1px solid #cccccc; \n            border-radius: 4px; \n        }\n        QStatusBar {\n            background-color: #f0f0f0;\n            border-top: 1px solid #cccccc;\n            color: #333333;\n        }\n        QMenuBar {\n            background-color: #f0f0f0;\n            border-bottom: 1px solid #cccccc;\n        }\n        QMenuBar::item {\n            background-color: transparent;\n            padding: 4px 8px;\n        }\n        QMenuBar::item:selected {\n            background-color: #e0e0e0;\n        }\n        QMenu {\n            background-color: #ffffff;\n            border: 1px solid #cccccc;\n        }\n        QMenu::item {\n            padding: 5px 10px;\n        }\n        QMenu::item:selected {\n            background-color: #e0e0e0;\n        }\n        "
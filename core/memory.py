@@ -0,0 +1,20 @@
+import time
+
+_memory_process = None
+_memory_sample = (0.0, None)
+
+def get_memory_usage_mb():
+    global _memory_process, _memory_sample
+    now = time.monotonic()
+    sampled_at, usage = _memory_sample
+    if usage is not None and now - sampled_at < 0.5:
+        return usage
+    if _memory_process is None:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        _memory_process = psutil.Process()
+    usage = _memory_process.memory_info().rss / 1024 / 1024
+    _memory_sample = (now, usage)
+    return usage
@@ -1,7 +1,28 @@
-from dataclasses import dataclass, field
+import string
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Any, Optional
 
-@dataclass
+LETTERS = tuple(string.ascii_uppercase)
+UNKNOWN_LETTER = 255
+_LETTER_INDEX = {letter: i for i, letter in enumerate(LETTERS)}
+RARITY_GROUPS = ('A-Mythic', 'B-Rare', 'C-Uncommon', 'D-Common', 'E-Other')
+_RARITY_INDEX = {'mythic': 0, 'rare': 1, 'uncommon': 2, 'common': 3}
+CONDITION_GROUPS = ('A-Mint', 'B-Near Mint', 'C-Lightly Played', 'D-Moderately Played', 'E-Heavily Played', 'F-Damaged')
+_CONDITION_INDEX = {'mint': 0, 'near mint': 1, 'lightly played': 2, 'moderately played': 3, 'heavily played': 4, 'damaged': 5}
+
+_SUPERTYPES = frozenset({'Legendary', 'Basic', 'Snow', 'World', 'Ongoing'})
+_PRIMARY_TYPES: Dict[str, str] = {}
+
+def _parse_primary_type(type_line: str) -> str:
+    if not type_line:
+        return 'Unknown Type'
+    primary_type = type_line.partition('—')[0].strip() or type_line.partition(' - ')[0].strip()
+    if ' ' in primary_type:
+        types = primary_type.split()
+        return next((t for t in types if t not in _SUPERTYPES), types[-1])
+    return primary_type
+
+@dataclass(slots=True)
 class Card:
     scryfall_id: str
     name: str
@@ -15,6 +36,30 @@ class Card:
     quantity: int = 1
     condition: str = 'N/A'
     sorted_count: int = 0
+    _primary_type: str = field(init=False, repr=False, compare=False, default='')
+    _first_letter_ord: int = field(init=False, repr=False, compare=False, default=UNKNOWN_LETTER)
+    _rarity_idx: int = field(init=False, repr=False, compare=False, default=4)
+    _condition_idx: int = field(init=False, repr=False, compare=False, default=1)
+
+    def __post_init__(self):
+        primary_type = _PRIMARY_TYPES.get(self.type_line)
+        if primary_type is None:
+            primary_type = _PRIMARY_TYPES[self.type_line] = _parse_primary_type(self.type_line)
+        self._primary_type = primary_type
+        name = self.name
+        if name and name != 'N/A':
+            code = ord(name[0])
+            if code < 128:
+                code = (code & 0x5F) - 65
+                if 0 <= code < 26:
+                    self._first_letter_ord = code
+            else:
+                self._first_letter_ord = _LETTER_INDEX.get(name[0].upper(), UNKNOWN_LETTER)
+        self._rarity_idx = _RARITY_INDEX.get((self.rarity or '').lower(), 4)
+        self._condition_idx = _CONDITION_INDEX.get((self.condition or '').lower(), 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
 
     @classmethod
     def from_scryfall_dict(cls, data: Dict[str, Any]) -> 'Card':
@@ -107,4 +152,9 @@ class SortGroup:
     def sorted_percentage(self) -> float:
         if self.total_count == 0:
             return 100.0
-        return self.sorted_count / self.total_count * 100
\ No newline at end of file
+        return self.sorted_count / self.total_count * 100
+@dataclass(slots=True)
+class PileBucket:
+    cards: List[Card] = field(default_factory=list)
+    total: int = 0
+    unsorted: int = 0
@@ -1,31 +1,87 @@
-import collections
-import string
+import array
+import heapq
+import itertools
+import operator
+import sys
 from typing import Dict, List, Tuple, Optional
-from core.models import Card, SortGroup
+from core.models import CONDITION_GROUPS, LETTERS, RARITY_GROUPS, UNKNOWN_LETTER, Card, PileBucket, SortGroup
+
+_COLOR_NAMES = {'W': 'White', 'U': 'Blue', 'B': 'Black', 'R': 'Red', 'G': 'Green'}
+_COLOR_IDENTITY_LABELS: Dict[tuple, str] = {}
+_UNSORTED_COUNT = operator.attrgetter('unsorted_count')
 
 class SorterPlanner:
 
     def __init__(self):
         self.sort_criteria = {'Set': self._sort_by_set, 'Color Identity': self._sort_by_color_identity, 'Rarity': self._sort_by_rarity, 'Type Line': self._sort_by_type_line, 'First Letter': self._sort_by_first_letter, 'Name': self._sort_by_name, 'Condition': self._sort_by_condition, 'Commander Staple': self._sort_by_commander_staple}
+        self._criteria_set = frozenset(self.sort_criteria)
 
     def create_sorting_plan(self, cards: List[Card], sort_order: List[str]) -> List[SortGroup]:
         if not cards or not sort_order:
             return []
-        first_criterion = sort_order[0]
-        grouped_cards = self._group_cards_by_criterion(cards, first_criterion)
+        for criterion in sort_order:
+            if criterion not in self._criteria_set:
+                raise ValueError(f'Unknown sort criterion: {criterion}')
+        sort_funcs = [self._key_getter(criterion) for criterion in sort_order]
+        depth = len(sort_funcs)
+        if depth == 1:
+            return self._create_single_level_plan(cards, sort_funcs[0])
+        groups_by_prefix: Dict[tuple, SortGroup] = {}
+        for card in cards:
+            keys = self._compute_keys(card, sort_funcs)
+            quantity = card.quantity
+            unsorted = quantity - card.sorted_count
+            for level in range(1, depth + 1):
+                prefix = keys[:level]
+                group = groups_by_prefix.get(prefix)
+                if group is None:
+                    group = groups_by_prefix[prefix] = SortGroup(group_name=keys[level - 1], count=0)
+                    if level < depth:
+                        group.sub_groups = []
+                group.cards.append(card)
+                group.total_count += quantity
+                group.unsorted_count += unsorted
         sort_groups = []
-        for group_name, group_cards in grouped_cards.items():
-            total_count = sum((card.quantity for card in group_cards))
-            unsorted_count = sum((card.quantity - card.sorted_count for card in group_cards))
-            sort_group = SortGroup(group_name=group_name, count=unsorted_count, cards=group_cards)
-            sort_group.total_count = total_count
-            sort_group.unsorted_count = unsorted_count
-            if len(sort_order) > 1:
-                sort_group.sub_groups = self.create_sorting_plan(group_cards, sort_order[1:])
-            sort_groups.append(sort_group)
-        sort_groups.sort(key=lambda g: g.unsorted_count, reverse=True)
+        for prefix, group in groups_by_prefix.items():
+            group.count = group.unsorted_count
+            if len(prefix) == 1:
+                sort_groups.append(group)
+            else:
+                groups_by_prefix[prefix[:-1]].sub_groups.append(group)
+        for prefix, group in groups_by_prefix.items():
+            if len(prefix) < depth:
+                group.sub_groups.sort(key=_UNSORTED_COUNT, reverse=True)
+                group._name_to_sub = {sub_group.group_name: sub_group for sub_group in group.sub_groups}
+        sort_groups.sort(key=_UNSORTED_COUNT, reverse=True)
+        return sort_groups
+
+    def _create_single_level_plan(self, cards: List[Card], sort_func) -> List[SortGroup]:
+        groups: Dict[str, SortGroup] = {}
+        for card in cards:
+            key = sort_func(card)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = SortGroup(group_name=key, count=0)
+            group.cards.append(card)
+            quantity = card.quantity
+            group.total_count += quantity
+            group.unsorted_count += quantity - card.sorted_count
+        sort_groups = list(groups.values())
+        for group in sort_groups:
+            group.count = group.unsorted_count
+        sort_groups.sort(key=_UNSORTED_COUNT, reverse=True)
         return sort_groups
 
+    def _compute_keys(self, card: Card, sort_funcs) -> tuple:
+        return tuple([sort_func(card) for sort_func in sort_funcs])
+
+    def _key_getter(self, criterion: str):
+        if criterion == 'Set':
+            return operator.attrgetter('set_name')
+        if criterion == 'Name':
+            return operator.attrgetter('name')
+        return self.sort_criteria[criterion]
+
     def create_set_letter_plan(self, cards: List[Card], set_name: str, group_low_count: bool=True, optimal_grouping: bool=False, threshold: int=20) -> Tuple[List[SortGroup], Dict[str, str]]:
         if optimal_grouping:
             return self._create_optimal_letter_plan(cards, threshold)
@@ -35,11 +91,8 @@ class SorterPlanner:
             return self._create_simple_letter_plan(cards)
 
     def _create_grouped_letter_plan(self, cards: List[Card], threshold: int) -> Tuple[List[SortGroup], Dict[str, str]]:
-        letter_counts = collections.defaultdict(int)
-        for card in cards:
-            name = getattr(card, 'name', '')
-            if name and name != 'N/A':
-                letter_counts[name[0].upper()] += card.quantity
+        letter_buckets, other_buckets = self._bucket_by_letter(cards)
+        letter_totals = self._letter_totals(letter_buckets)
         mapping = {}
         buffer = ''
         buffer_total = 0
@@ -51,13 +104,12 @@ class SorterPlanner:
                     mapping[ch] = buffer
                 buffer = ''
                 buffer_total = 0
-        letters = string.ascii_uppercase
-        for i, letter in enumerate(letters):
-            count = letter_counts.get(letter, 0)
+        for i, letter in enumerate(LETTERS):
+            count = letter_totals[i]
             if 0 < count < threshold:
                 buffer += letter
                 buffer_total += count
-                next_letter_small = i < 25 and 0 < letter_counts.get(letters[i + 1], 0) < threshold
+                next_letter_small = i < 25 and 0 < letter_totals[i + 1] < threshold
                 if buffer_total >= threshold or not next_letter_small:
                     flush_buffer()
             else:
@@ -65,34 +117,17 @@ class SorterPlanner:
                 if count > 0:
                     mapping[letter] = letter
         flush_buffer()
-        piles = collections.defaultdict(lambda: {'cards': [], 'total': 0, 'unsorted': 0})
-        for card in cards:
-            name = getattr(card, 'name', '')
-            if name and name != 'N/A':
-                first_letter = name[0].upper()
-                pile_key = mapping.get(first_letter, first_letter)
-                piles[pile_key]['cards'].append(card)
-                piles[pile_key]['total'] += card.quantity
-                piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-        groups = []
-        for pile_name, pile_data in piles.items():
-            group = SortGroup(group_name=pile_name, count=pile_data['unsorted'], cards=pile_data['cards'])
-            group.total_count = pile_data['total']
-            group.unsorted_count = pile_data['unsorted']
-            groups.append(group)
-        return (groups, mapping)
+        return (self._assign_cards_to_piles(letter_buckets, other_buckets, mapping), mapping)
 
     def _create_optimal_letter_plan(self, cards: List[Card], threshold: int) -> Tuple[List[SortGroup], Dict[str, str]]:
-        import string
-        raw_letter_totals = collections.defaultdict(int)
-        for card in cards:
-            name = getattr(card, 'name', '')
-            if name and name != 'N/A':
-                raw_letter_totals[name[0].upper()] += card.quantity
-        letter_counts = [(letter, raw_letter_totals.get(letter, 0)) for letter in string.ascii_uppercase]
-        letter_counts.sort(key=lambda x: x[1], reverse=True)
-        high_letters = [(l, c) for l, c in letter_counts if c >= threshold]
-        low_letters = [(l, c) for l, c in letter_counts if 0 < c < threshold]
+        letter_buckets, other_buckets = self._bucket_by_letter(cards)
+        high_letters = []
+        low_letters = []
+        for letter, count in zip(LETTERS, self._letter_totals(letter_buckets)):
+            if count >= threshold:
+                high_letters.append((letter, count))
+            elif count > 0:
+                low_letters.append((letter, count))
         mapping = {}
         for letter, count in high_letters:
             mapping[letter] = letter
@@ -102,121 +137,126 @@ class SorterPlanner:
                 group_name = ''.join(sorted([letter for letter, _ in group]))
                 for letter, _ in group:
                     mapping[letter] = group_name
-        for letter in string.ascii_uppercase:
-            if letter not in mapping:
-                mapping[letter] = letter
-        piles = collections.defaultdict(lambda: {'cards': [], 'total': 0, 'unsorted': 0})
+        for letter in LETTERS:
+            mapping.setdefault(letter, letter)
+        return (self._assign_cards_to_piles(letter_buckets, other_buckets, mapping), mapping)
+
+    def _bucket_by_letter(self, cards: List[Card]) -> Tuple[List[Optional[PileBucket]], Dict[str, PileBucket]]:
+        letter_buckets: List[Optional[PileBucket]] = [None] * len(LETTERS)
+        other_buckets: Dict[str, PileBucket] = {}
         for card in cards:
-            name = getattr(card, 'name', '')
-            if name and name != 'N/A':
+            letter_ord = card._first_letter_ord
+            if letter_ord != UNKNOWN_LETTER:
+                bucket = letter_buckets[letter_ord]
+                if bucket is None:
+                    bucket = letter_buckets[letter_ord] = PileBucket()
+            else:
+                name = card.name
+                if not name or name == 'N/A':
+                    continue
                 first_letter = name[0].upper()
-                pile_key = mapping.get(first_letter, first_letter)
-                piles[pile_key]['cards'].append(card)
-                piles[pile_key]['total'] += card.quantity
-                piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-        groups = []
-        for pile_name, pile_data in piles.items():
-            group = SortGroup(group_name=pile_name, count=pile_data['unsorted'], cards=pile_data['cards'])
-            group.total_count = pile_data['total']
-            group.unsorted_count = pile_data['unsorted']
-            groups.append(group)
-        return (groups, mapping)
+                bucket = other_buckets.get(first_letter)
+                if bucket is None:
+                    bucket = other_buckets[first_letter] = PileBucket()
+            bucket.cards.append(card)
+            quantity = card.quantity
+            bucket.total += quantity
+            bucket.unsorted += quantity - card.sorted_count
+        return (letter_buckets, other_buckets)
+
+    def _letter_totals(self, letter_buckets: List[Optional[PileBucket]]) -> array.array:
+        return array.array('q', [bucket.total if bucket is not None else 0 for bucket in letter_buckets])
 
     def _optimal_bin_packing(self, items, capacity):
         if not items:
             return []
-        items = sorted(items, key=lambda x: x[1], reverse=True)
-        bins = []
+        count_buckets = [[] for _ in range(max((c for _, c in items)) + 1)]
         for item in items:
-            letter, count = item
-            best_bin = None
-            best_remaining_space = float('inf')
-            for bin_items in bins:
-                if len(bin_items) >= 3:
-                    continue
-                current_sum = sum((c for _, c in bin_items))
-                if current_sum + count <= capacity:
-                    remaining_space = capacity - (current_sum + count)
-                    if remaining_space < best_remaining_space:
-                        best_remaining_space = remaining_space
-                        best_bin = bin_items
-            if best_bin is not None:
-                best_bin.append(item)
-            else:
-                bins.append([item])
+            count_buckets[item[1]].append(item)
+        min_weight = min((c for _, c in items))
+        bins = []
+        bin_sums = []
+        open_heap = []
+        for bucket in reversed(count_buckets):
+            for item in bucket:
+                count = item[1]
+                space = capacity - count
+                best_id = None
+                staged = []
+                while open_heap:
+                    entry = heapq.heappop(open_heap)
+                    if -entry[0] <= space:
+                        best_id = entry[1]
+                        break
+                    staged.append(entry)
+                if best_id is None:
+                    best_id = len(bins)
+                    bins.append([])
+                    bin_sums.append(0)
+                bins[best_id].append(item)
+                bin_sums[best_id] += count
+                if len(bins[best_id]) < 3 and capacity - bin_sums[best_id] >= min_weight:
+                    staged.append((-bin_sums[best_id], best_id))
+                for entry in staged:
+                    heapq.heappush(open_heap, entry)
         return bins
 
     def _create_simple_letter_plan(self, cards: List[Card]) -> Tuple[List[SortGroup], Dict[str, str]]:
-        piles = collections.defaultdict(lambda: {'cards': [], 'total': 0, 'unsorted': 0})
-        for card in cards:
-            name = getattr(card, 'name', '')
-            if name and name != 'N/A':
-                pile_key = name[0].upper()
-                piles[pile_key]['cards'].append(card)
-                piles[pile_key]['total'] += card.quantity
-                piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-        groups = []
-        for pile_name, pile_data in piles.items():
-            group = SortGroup(group_name=pile_name, count=pile_data['unsorted'], cards=pile_data['cards'])
-            group.total_count = pile_data['total']
-            group.unsorted_count = pile_data['unsorted']
-            groups.append(group)
-        mapping = {letter: letter for letter in string.ascii_uppercase}
-        return (groups, mapping)
+        letter_buckets, other_buckets = self._bucket_by_letter(cards)
+        mapping = dict(zip(LETTERS, LETTERS))
+        return (self._assign_cards_to_piles(letter_buckets, other_buckets, mapping), mapping)
 
-    def _group_cards_by_criterion(self, cards: List[Card], criterion: str) -> Dict[str, List[Card]]:
-        if criterion not in self.sort_criteria:
-            raise ValueError(f'Unknown sort criterion: {criterion}')
-        sort_func = self.sort_criteria[criterion]
-        grouped = collections.defaultdict(list)
-        for card in cards:
-            group_key = sort_func(card)
-            grouped[group_key].append(card)
-        return dict(grouped)
+    def _assign_cards_to_piles(self, letter_buckets: List[Optional[PileBucket]], other_buckets: Dict[str, PileBucket], mapping: Dict[str, str]) -> List[SortGroup]:
+        piles: Dict[str, PileBucket] = {}
+        for first_letter, bucket in itertools.chain(zip(LETTERS, letter_buckets), other_buckets.items()):
+            if bucket is None:
+                continue
+            pile_key = mapping.get(first_letter) or first_letter
+            pile = piles.get(pile_key)
+            if pile is None:
+                piles[pile_key] = bucket
+            else:
+                pile.cards.extend(bucket.cards)
+                pile.total += bucket.total
+                pile.unsorted += bucket.unsorted
+        return [SortGroup(group_name=pile_key, count=bucket.unsorted, cards=bucket.cards, total_count=bucket.total, unsorted_count=bucket.unsorted) for pile_key, bucket in piles.items()]
 
     def _sort_by_set(self, card: Card) -> str:
-        return getattr(card, 'set_name', 'Unknown Set')
+        return card.set_name
 
     def _sort_by_color_identity(self, card: Card) -> str:
-        colors = getattr(card, 'color_identity', [])
-        if not colors:
-            return 'Colorless'
-        elif len(colors) == 1:
-            color_names = {'W': 'White', 'U': 'Blue', 'B': 'Black', 'R': 'Red', 'G': 'Green'}
-            return color_names.get(colors[0], 'Unknown')
-        else:
-            return f"Multicolor ({''.join(sorted(colors))})"
+        colors = tuple(card.color_identity)
+        label = _COLOR_IDENTITY_LABELS.get(colors)
+        if label is None:
+            if not colors:
+                label = 'Colorless'
+            elif len(colors) == 1:
+                label = _COLOR_NAMES.get(colors[0], 'Unknown')
+            else:
+                label = f"Multicolor ({''.join(sorted(colors))})"
+            label = _COLOR_IDENTITY_LABELS[colors] = sys.intern(label)
+        return label
 
     def _sort_by_rarity(self, card: Card) -> str:
-        rarity = getattr(card, 'rarity', 'common')
-        rarity_order = {'mythic': 'A-Mythic', 'rare': 'B-Rare', 'uncommon': 'C-Uncommon', 'common': 'D-Common'}
-        return rarity_order.get(rarity.lower(), 'E-Other')
+        return RARITY_GROUPS[card._rarity_idx]
 
     def _sort_by_type_line(self, card: Card) -> str:
-        type_line = getattr(card, 'type_line', '')
-        if not type_line:
-            return 'Unknown Type'
-        primary_type = type_line.split(' \x14 ')[0].strip()
-        if ' ' in primary_type:
-            types = primary_type.split()
-            supertypes = {'Legendary', 'Basic', 'Snow', 'World', 'Ongoing'}
-            main_type = next((t for t in types if t not in supertypes), types[-1])
-            return main_type
-        return primary_type
+        return card._primary_type
 
     def _sort_by_first_letter(self, card: Card) -> str:
-        name = getattr(card, 'name', '')
+        letter_ord = card._first_letter_ord
+        if letter_ord != UNKNOWN_LETTER:
+            return LETTERS[letter_ord]
+        name = card.name
         if not name or name == 'N/A':
             return 'Unknown'
         return name[0].upper()
 
     def _sort_by_name(self, card: Card) -> str:
-        return getattr(card, 'name', 'Unknown')
+        return card.name
 
     def _sort_by_condition(self, card: Card) -> str:
-        condition = getattr(card, 'condition', 'Near Mint')
-        condition_order = {'mint': 'A-Mint', 'near mint': 'B-Near Mint', 'lightly played': 'C-Lightly Played', 'moderately played': 'D-Moderately Played', 'heavily played': 'E-Heavily Played', 'damaged': 'F-Damaged'}
-        return condition_order.get(condition.lower(), 'B-Near Mint')
+        return CONDITION_GROUPS[card._condition_idx]
 
     def _sort_by_commander_staple(self, card: Card) -> str:
         return 'Non-Staple'
@@ -227,12 +267,13 @@ class SorterPlanner:
     def validate_sort_order(self, sort_order: List[str]) -> Tuple[bool, Optional[str]]:
         if not sort_order:
             return (False, 'Sort order cannot be empty')
-        available_criteria = self.get_available_criteria()
+        seen = set()
         for criterion in sort_order:
-            if criterion not in available_criteria:
+            if criterion not in self._criteria_set:
                 return (False, f'Unknown criterion: {criterion}')
-        if len(sort_order) != len(set(sort_order)):
-            return (False, 'Sort order contains duplicate criteria')
+            if criterion in seen:
+                return (False, 'Sort order contains duplicate criteria')
+            seen.add(criterion)
         return (True, None)
 
     def get_cards_at_path(self, sort_groups: List[SortGroup], path: List[str]) -> List[Card]:
@@ -241,16 +282,16 @@ class SorterPlanner:
             for group in sort_groups:
                 all_cards.extend(group.cards)
             return all_cards
-        current_groups = sort_groups
-        for path_element in path:
-            found_group = None
-            for group in current_groups:
-                if group.group_name == path_element:
-                    found_group = group
-                    break
-            if not found_group:
-                return []
-            if path_element == path[-1]:
-                return found_group.cards
-            current_groups = found_group.sub_groups if found_group.sub_groups else []
-        return []
\ No newline at end of file
+        current = None
+        for group in sort_groups:
+            if group.group_name == path[0]:
+                current = group
+                break
+        if current is None:
+            return []
+        try:
+            for path_element in path[1:]:
+                current = current._name_to_sub[path_element]
+        except (AttributeError, KeyError):
+            return []
+        return current.cards
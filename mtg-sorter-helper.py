@@ -1,34 +1,61 @@
 import argparse
+import copy
 import logging
+import logging.handlers
 import os
 os.environ['QT_API'] = 'pyqt6'
+import pathlib
+import queue
 import sys
+import threading
+import time
 import traceback
-from PyQt6.QtCore import Qt, QCoreApplication, QTimer
-from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor
+import zlib
+from PyQt6.QtCore import Qt, QCoreApplication, QElapsedTimer, QEventLoop, QSettings, QSocketNotifier, QThread, QTimer
+from PyQt6.QtGui import QFont, QPixmap, QPixmapCache, QPainter, QColor
 from PyQt6.QtWidgets import QApplication, QSplashScreen, QMessageBox
 from core.constants import Config, ThemeManager
-
-def get_memory_usage():
-    try:
-        import psutil
-        process = psutil.Process()
-        return process.memory_info().rss / 1024 / 1024
-    except ImportError:
-        return None
+from core.memory import get_memory_usage_mb
+_log_listener = None
+_log_buffer = None
 
 def check_memory_limit(limit_mb=1024):
-    usage = get_memory_usage()
+    usage = get_memory_usage_mb()
     if usage and usage > limit_mb:
         return (False, usage)
     return (True, usage)
 
+_exception_formatter = logging.Formatter()
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
 def setup_logging():
+    global _log_listener, _log_buffer
     try:
         log_dir = Config.APP_CACHE_DIR / 'logs'
         log_dir.mkdir(exist_ok=True)
         log_file = log_dir / 'mtg_toolkit.log'
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', handlers=[logging.FileHandler(log_file), logging.StreamHandler(sys.stdout)])
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        file_handler.setFormatter(formatter)
+        stream_handler.setFormatter(formatter)
+        _log_buffer = logging.handlers.MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True)
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+        _log_listener = logging.handlers.QueueListener(log_queue, _log_buffer, stream_handler, respect_handler_level=True)
+        _log_listener.start()
         logging.getLogger('matplotlib').setLevel(logging.WARNING)
         logging.getLogger('urllib3').setLevel(logging.WARNING)
         logging.getLogger('requests').setLevel(logging.WARNING)
@@ -36,21 +63,64 @@ def setup_logging():
     except Exception as e:
         logging.basicConfig(level=logging.INFO)
         logger = logging.getLogger(__name__)
-        logger.warning(f'Failed to setup advanced logging: {e}')
+        logger.warning('Failed to setup advanced logging: %s', e)
         return logger
 
+def flush_logging():
+    if _log_buffer is not None:
+        _log_buffer.flush()
+
+def stop_logging():
+    global _log_listener, _log_buffer
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    if _log_buffer is not None:
+        _log_buffer.close()
+        _log_buffer = None
+
+_splash_fonts = None
+
+def _get_splash_fonts():
+    global _splash_fonts
+    if _splash_fonts is None:
+        _splash_fonts = (QFont(Config.SYSTEM_FONT_NAME, 24, QFont.Weight.Bold), QFont(Config.SYSTEM_FONT_NAME, 12))
+    return _splash_fonts
+
+_SPLASH_SIZE = (400, 300)
+_SPLASH_TITLE = 'MTG Toolkit\nEnhanced'
+_SPLASH_SUBTITLE = 'Loading collection management tools...'
+_SPLASH_SUBTITLE_POS = (20, 250)
+_SPLASH_COLORS = ('#2b2b2b', '#f0f0f0', '#00aaff')
+
+def _splash_cache_path(title_font, subtitle_font):
+    key = '|'.join((_SPLASH_TITLE, _SPLASH_SUBTITLE, title_font.toString(), subtitle_font.toString(), '%dx%d' % _SPLASH_SIZE, '%d,%d' % _SPLASH_SUBTITLE_POS, *_SPLASH_COLORS))
+    return Config.APP_CACHE_DIR / f'splash_{zlib.crc32(key.encode("utf-8")):08x}.png'
+
 def create_splash_screen():
     try:
-        splash_pixmap = QPixmap(400, 300)
-        splash_pixmap.fill(QColor('#2b2b2b'))
-        painter = QPainter(splash_pixmap)
-        painter.setPen(QColor('#f0f0f0'))
-        painter.setFont(QFont(Config.SYSTEM_FONT_NAME, 24, QFont.Weight.Bold))
-        painter.drawText(splash_pixmap.rect(), Qt.AlignmentFlag.AlignCenter, 'MTG Toolkit\nEnhanced')
-        painter.setFont(QFont(Config.SYSTEM_FONT_NAME, 12))
-        painter.setPen(QColor('#00aaff'))
-        painter.drawText(20, 250, 'Loading collection management tools...')
-        painter.end()
+        splash_pixmap = QPixmapCache.find('splash')
+        if splash_pixmap is None:
+            title_font, subtitle_font = _get_splash_fonts()
+            splash_cache_path = _splash_cache_path(title_font, subtitle_font)
+            splash_pixmap = QPixmap(str(splash_cache_path)) if splash_cache_path.exists() else QPixmap()
+            if splash_pixmap.isNull():
+                background, title_color, subtitle_color = _SPLASH_COLORS
+                splash_pixmap = QPixmap(*_SPLASH_SIZE)
+                splash_pixmap.fill(QColor(background))
+                painter = QPainter(splash_pixmap)
+                painter.setPen(QColor(title_color))
+                painter.setFont(title_font)
+                painter.drawText(splash_pixmap.rect(), Qt.AlignmentFlag.AlignCenter, _SPLASH_TITLE)
+                painter.setFont(subtitle_font)
+                painter.setPen(QColor(subtitle_color))
+                painter.drawText(*_SPLASH_SUBTITLE_POS, _SPLASH_SUBTITLE)
+                painter.end()
+                for stale in Config.APP_CACHE_DIR.glob('splash*.png'):
+                    if stale != splash_cache_path:
+                        stale.unlink(missing_ok=True)
+                splash_pixmap.save(str(splash_cache_path), 'PNG')
+            QPixmapCache.insert('splash', splash_pixmap)
         splash = QSplashScreen(splash_pixmap)
         splash.setWindowFlags(Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.SplashScreen)
         return splash
@@ -58,25 +128,57 @@ def create_splash_screen():
         print(f'Failed to create splash screen: {e}')
         return None
 
-def check_system_requirements():
+_disk_sample = (0.0, None)
+
+def _free_space_bytes():
+    global _disk_sample
+    now = time.monotonic()
+    sampled_at, free_space = _disk_sample
+    if free_space is None or now - sampled_at >= 60:
+        if hasattr(os, 'statvfs'):
+            stat = os.statvfs(Config.APP_CACHE_DIR.parent)
+            free_space = stat.f_bavail * stat.f_frsize
+        else:
+            import shutil
+            free_space = shutil.disk_usage(Config.APP_CACHE_DIR.parent).free
+        _disk_sample = (now, free_space)
+    return free_space
+
+def check_local_requirements():
     issues = []
-    if sys.version_info < (3, 8):
-        issues.append(f'Python 3.8+ required, found {sys.version_info.major}.{sys.version_info.minor}')
+    if sys.version_info < (3, 10):
+        issues.append(f'Python 3.10+ required, found {sys.version_info.major}.{sys.version_info.minor}')
     try:
-        import shutil
-        free_space = shutil.disk_usage(Config.APP_CACHE_DIR.parent).free
+        free_space = _free_space_bytes()
         required_space = 1024 * 1024 * 1024
         if free_space < required_space:
             issues.append(f'Low disk space: {free_space // (1024 * 1024)} MB available, 1GB recommended')
     except Exception:
         pass
-    try:
-        import requests
-        requests.head('https://api.scryfall.com', timeout=5)
-    except Exception:
-        issues.append('Could not connect to Scryfall API. Check your internet connection.')
     return issues
 
+def install_sigint_handler(app):
+    import signal
+    import socket
+    read_sock, write_sock = socket.socketpair()
+    read_sock.setblocking(False)
+    write_sock.setblocking(False)
+    signal.set_wakeup_fd(write_sock.fileno())
+
+    def signal_handler(sig, frame):
+        print('\nApplication interrupted by user')
+        app.quit()
+    signal.signal(signal.SIGINT, signal_handler)
+    notifier = QSocketNotifier(read_sock.fileno(), QSocketNotifier.Type.Read, app)
+
+    def drain_wakeup_socket():
+        try:
+            read_sock.recv(1024)
+        except OSError:
+            pass
+    notifier.activated.connect(drain_wakeup_socket)
+    return (notifier, read_sock, write_sock)
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='MTG Toolkit Enhanced - Collection Management Tool', formatter_class=argparse.RawDescriptionHelpFormatter, epilog='\nExamples:\n  %(prog)s                          # Normal startup\n  %(prog)s --theme light            # Start with light theme\n  %(prog)s --debug                  # Enable debug logging\n  %(prog)s --clear-cache            # Clear cache on startup\n  %(prog)s --import file.csv        # Import collection on startup\n        ')
     parser.add_argument('--version', action='version', version='MTG Toolkit Enhanced v1.0')
@@ -86,7 +188,13 @@ def parse_arguments():
     parser.add_argument('--import', dest='import_file', metavar='FILE', help='Import CSV collection file on startup')
     parser.add_argument('--no-splash', action='store_true', help='Skip splash screen')
     parser.add_argument('--safe-mode', action='store_true', help='Start in safe mode (minimal features, useful for troubleshooting)')
-    return parser.parse_args()
+    args = parser.parse_args()
+    args.import_name = None
+    if args.import_file:
+        import_path = pathlib.Path(args.import_file).expanduser().resolve()
+        args.import_name = import_path.name
+        args.import_file = str(import_path)
+    return args
 
 def safe_import_main_window():
     try:
@@ -100,11 +208,22 @@ def safe_import_main_window():
         traceback.print_exc()
         return None
 
+def preload_main_window():
+    result = {}
+
+    def load():
+        result['window_class'] = safe_import_main_window()
+    loader = threading.Thread(target=load, name='main-window-import', daemon=True)
+    loader.start()
+    return (loader, result)
+
 def main():
     logger = None
     app = None
     main_window = None
     splash = None
+    network_check_thread = None
+    exec_entered = False
     try:
         args = parse_arguments()
         try:
@@ -117,23 +236,46 @@ def main():
         except Exception as e:
             print(f'Critical error: Failed to create QApplication: {e}')
             return 1
+        startup_timer = QElapsedTimer()
+        startup_timer.start()
+        startup_settings = QSettings(Config.ORG_NAME, Config.APP_NAME)
+        last_startup_ms = startup_settings.value('startup/last_duration_ms', 0, type=int)
+        fast_startup = 0 < last_startup_ms < Config.SPLASH_MIN_STARTUP_MS
+        if not args.no_splash and (not args.safe_mode) and (not fast_startup):
+            try:
+                splash = create_splash_screen()
+                if splash:
+                    splash.show()
+                    splash.showMessage('Initializing UI...', Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter, QColor('white'))
+                    app.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+            except Exception as e:
+                print(f'Failed to create splash screen: {e}')
+                splash = None
+        main_window_loader, main_window_import = preload_main_window()
         logger = setup_logging()
+        log_flush_timer = QTimer(app)
+        log_flush_timer.setInterval(Config.LOG_FLUSH_INTERVAL_MS)
+        log_flush_timer.timeout.connect(flush_logging)
+        log_flush_timer.start()
         if args.debug:
             logging.getLogger().setLevel(logging.DEBUG)
             logger.debug('Debug logging enabled.')
-        logger.info('Starting MTG Toolkit Enhanced')
+        logger.debug('Starting MTG Toolkit Enhanced')
         try:
             QCoreApplication.setApplicationName(Config.APP_NAME)
             QCoreApplication.setApplicationVersion('Enhanced v1.0')
             QCoreApplication.setOrganizationName(Config.ORG_NAME)
         except Exception as e:
-            logger.warning(f'Failed to set application metadata: {e}')
+            logger.warning('Failed to set application metadata: %s', e)
         if args.clear_cache:
             try:
                 from api.mtgjson_api import MTGJsonAPI
                 logger.info('Clearing cache on startup...')
                 api = MTGJsonAPI()
-                if api.clear_cache():
+                cleared = api.clear_cache()
+                if splash:
+                    splash.hide()
+                if cleared:
                     logger.info('Cache cleared successfully.')
                     try:
                         QMessageBox.information(None, 'Cache Cleared', 'Application cache has been cleared.')
@@ -146,48 +288,39 @@ def main():
                     except:
                         print('Warning: Could not clear application cache.')
             except Exception as e:
-                logger.error(f'Error during cache clearing: {e}')
-        if not args.safe_mode:
+                logger.error('Error during cache clearing: %s', e)
+
+        def report_requirement_issues(issues):
+            if not issues:
+                return
+            issue_str = '\n'.join((f'- {issue}' for issue in issues))
+            logger.warning('System requirement issues detected: %s', issues)
             try:
-                issues = check_system_requirements()
-                if issues:
-                    issue_str = '\n'.join((f'- {issue}' for issue in issues))
-                    logger.warning(f'System requirement issues detected: {issues}')
-                    try:
-                        QMessageBox.warning(None, 'System Requirement Warnings', f'The following issues were detected:\n\n{issue_str}\n\nThe application will continue, but some features may not work correctly.')
-                    except:
-                        print(f'Warning: System requirement issues detected:\n{issue_str}')
-            except Exception as e:
-                logger.warning(f'Failed to check system requirements: {e}')
+                QMessageBox.warning(main_window, 'System Requirement Warnings', f'The following issues were detected:\n\n{issue_str}\n\nThe application will continue, but some features may not work correctly.')
+            except:
+                print(f'Warning: System requirement issues detected:\n{issue_str}')
         try:
             theme_stylesheet = ThemeManager.get_light_stylesheet() if args.theme == 'light' else ThemeManager.get_dark_stylesheet()
             app.setStyleSheet(theme_stylesheet)
         except Exception as e:
-            logger.warning(f'Failed to apply theme: {e}')
+            logger.warning('Failed to apply theme: %s', e)
         try:
             app.setFont(QFont(Config.SYSTEM_FONT_NAME, 10))
         except Exception as e:
-            logger.warning(f'Failed to set default font: {e}')
-        if not args.no_splash and (not args.safe_mode):
-            try:
-                splash = create_splash_screen()
-                if splash:
-                    splash.show()
-                    splash.showMessage('Initializing UI...', Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter, QColor('white'))
-                    app.processEvents()
-            except Exception as e:
-                logger.warning(f'Failed to create splash screen: {e}')
-                splash = None
-        logger.info('Creating main window...')
+            logger.warning('Failed to set default font: %s', e)
+        logger.debug('Creating main window...')
         try:
-            MTGToolkitWindow = safe_import_main_window()
+            while main_window_loader.is_alive():
+                app.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+                main_window_loader.join(0.01)
+            MTGToolkitWindow = main_window_import.get('window_class')
             if MTGToolkitWindow is None:
                 raise ImportError('Failed to import main window class')
             main_window = MTGToolkitWindow()
             if main_window is None:
                 raise RuntimeError('Failed to create main window instance')
         except Exception as e:
-            logger.critical(f'Failed to create main window: {e}', exc_info=True)
+            logger.critical('Failed to create main window: %s', e, exc_info=True)
             if splash:
                 splash.close()
             try:
@@ -195,27 +328,46 @@ def main():
             except:
                 print(f'Critical error: Failed to create main window: {e}')
             return 1
-        if args.import_file and main_window:
+        if args.import_file and main_window and (not os.path.isfile(args.import_file)):
+            logger.error('Startup import file not found: %s', args.import_file)
+        elif args.import_file and main_window:
             try:
                 if splash:
-                    splash.showMessage(f'Importing {os.path.basename(args.import_file)}...', Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter, QColor('white'))
+                    splash.showMessage(f'Importing {args.import_name}...', Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter, QColor('white'))
                 QTimer.singleShot(100, lambda: main_window.sorter_tab.import_csv(filepath=args.import_file))
             except Exception as e:
-                logger.error(f'Failed to schedule startup import: {e}')
-        logger.info('Showing main window...')
+                logger.error('Failed to schedule startup import: %s', e)
+        logger.debug('Showing main window...')
         try:
             main_window.show()
             if splash:
                 splash.finish(main_window)
+            startup_settings.setValue('startup/last_duration_ms', startup_timer.elapsed())
         except Exception as e:
-            logger.error(f'Failed to show main window: {e}')
+            logger.error('Failed to show main window: %s', e)
             if splash:
                 try:
                     splash.close()
                 except:
                     pass
             return 1
-        logger.info('MTG Toolkit Enhanced startup completed successfully')
+        logger.debug('MTG Toolkit Enhanced startup completed successfully')
+        if not args.safe_mode:
+            try:
+                report_requirement_issues(check_local_requirements())
+            except Exception as e:
+                logger.warning('Failed to check system requirements: %s', e)
+            try:
+                from workers.threads import NetworkCheckWorker
+                network_check_thread = QThread()
+                network_check_worker = NetworkCheckWorker()
+                network_check_worker.moveToThread(network_check_thread)
+                network_check_thread.started.connect(network_check_worker.run)
+                network_check_worker.finished.connect(report_requirement_issues)
+                network_check_worker.finished.connect(network_check_thread.quit)
+                network_check_thread.start()
+            except Exception as e:
+                logger.warning('Failed to start network check: %s', e)
 
         def handle_exception(exc_type, exc_value, exc_traceback):
             if issubclass(exc_type, KeyboardInterrupt):
@@ -229,18 +381,23 @@ def main():
                 print(f'Critical error: {error_msg}')
         sys.excepthook = handle_exception
         try:
+            sigint_wakeup = install_sigint_handler(app)
+        except Exception as e:
+            logger.warning('Failed to install interrupt handler: %s', e)
+        try:
+            exec_entered = True
             exit_code = app.exec()
-            logger.info(f'Application exiting with code: {exit_code}')
+            logger.debug('Application exiting with code: %s', exit_code)
             return exit_code
         except Exception as e:
-            logger.critical(f'Error in application event loop: {e}', exc_info=True)
+            logger.critical('Error in application event loop: %s', e, exc_info=True)
             return 1
     except KeyboardInterrupt:
         logger.info('Application interrupted by user')
         return 0
     except Exception as e:
         try:
-            logger.critical(f'Fatal error during startup: {e}', exc_info=True)
+            logger.critical('Fatal error during startup: %s', e, exc_info=True)
         except:
             print(f'Fatal error during startup: {e}')
             traceback.print_exc()
@@ -254,22 +411,28 @@ def main():
             print(f'Critical error: {e}')
         return 1
     finally:
+        for window in (splash, main_window):
+            try:
+                if window and window.isVisible():
+                    window.close()
+            except RuntimeError:
+                pass
         try:
-            if splash:
-                splash.close()
-            if main_window:
-                main_window.close()
-            if app:
+            if app and (not exec_entered):
                 app.quit()
-        except:
+        except RuntimeError:
             pass
+        try:
+            if network_check_thread is not None and network_check_thread.isRunning():
+                network_check_thread.quit()
+                network_check_thread.wait(5000)
+        except RuntimeError:
+            pass
+        try:
+            stop_logging()
+        except (RuntimeError, OSError) as e:
+            print(f'Failed to stop logging cleanly: {e}')
 if __name__ == '__main__':
-    import signal
-
-    def signal_handler(sig, frame):
-        print('\nApplication interrupted by user')
-        sys.exit(0)
-    signal.signal(signal.SIGINT, signal_handler)
     try:
         exit_code = main()
         sys.exit(exit_code)
@@ -1,14 +1,27 @@
+import collections
 import csv
-from PyQt6.QtCore import pyqtSignal, QThread, Qt
+import threading
+from PyQt6.QtCore import pyqtSignal, QLocale, QThread, QTimer, Qt
+from PyQt6.QtGui import QDoubleValidator
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QLabel, QLineEdit, QComboBox, QCheckBox, QGroupBox, QFileDialog, QMessageBox, QProgressBar, QTextEdit, QSplitter, QDialog
 from api.mtgjson_api import MTGJsonAPI
 from ui.debug_logger import AnalyzerTabDebugger, DebugLevel, DebugManager
 from ui.sorter_tab import ManaBoxSorterTab
 from ui.status_manager import StatusAwareMixin
-from workers.threads import SetAnalysisWorker, WorkerManager
+from workers.threads import WUBRG_CATEGORIES, AnalysisExportWorker, SetAnalysisWorker, WorkerManager, WubrgExportWorker, tally_wubrg_letters
+
+def _warm_matplotlib():
+    try:
+        import matplotlib.backends.backend_qtagg
+        import matplotlib.figure
+    except ImportError:
+        pass
 
 class SetAnalyzerTab(QWidget, StatusAwareMixin):
     RARITY_COLORS = {'common': '#9a9a9a', 'uncommon': '#c0c0c0', 'rare': '#d4af37', 'mythic': '#ff6600'}
+    WUBRG_COLORS = {'W': {'name': 'White', 'color': '#f0f0f0'}, 'U': {'name': 'Blue', 'color': '#007acc'}, 'B': {'name': 'Black', 'color': '#808080'}, 'R': {'name': 'Red', 'color': '#cc0000'}, 'G': {'name': 'Green', 'color': '#00cc66'}}
+    TYPE_CATEGORIES = {'Creature': {'keywords': ['creature'], 'color': '#00cc66'}, 'Instant': {'keywords': ['instant'], 'color': '#007acc'}, 'Sorcery': {'keywords': ['sorcery'], 'color': '#cc0000'}, 'Enchantment': {'keywords': ['enchantment'], 'color': '#9370db'}, 'Artifact': {'keywords': ['artifact'], 'color': '#808080'}, 'Planeswalker': {'keywords': ['planeswalker'], 'color': '#ff6600'}, 'Battle': {'keywords': ['battle'], 'color': '#cc00cc'}, 'Land': {'keywords': ['land'], 'color': '#8b4513'}}
+    LETTER_TICK_SIZES = ((15, 9), (10, 10), (6, 11))
     SET_COLORS = ['#007acc', '#ff6600', '#00cc66', '#cc0066', '#6600cc', '#cc6600', '#0066cc', '#cc0000', '#00cccc', '#cccc00']
     operation_started = pyqtSignal(str, int)
     operation_finished = pyqtSignal()
@@ -28,7 +41,19 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         self.toolbar = None
         self.toolbar_layout = None
         self.maximized_dialog = None
+        self._last_progress_emit = -1
+        self._last_render_key = None
+        self._chart_labels = None
+        self._last_layout_sig = None
+        self._multi_chart_source = None
+        self._wubrg_cache = None
+        self._card_type_cache = None
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(75)
+        self._redraw_timer.timeout.connect(self._do_redraw_chart)
         self.debugger = DebugManager.get_analyzer_debugger()
+        threading.Thread(target=_warm_matplotlib, name='matplotlib-import', daemon=True).start()
         main_layout = QVBoxLayout(self)
         splitter = QSplitter(Qt.Orientation.Horizontal)
         main_layout.addWidget(splitter)
@@ -92,6 +117,10 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         self.group_check.setToolTip('Combine letters with few cards')
         self.threshold_edit = QLineEdit('20')
         self.threshold_edit.setToolTip('Minimum cards for grouping')
+        threshold_validator = QDoubleValidator(1.0, 1000000000.0, 2, self.threshold_edit)
+        threshold_validator.setNotation(QDoubleValidator.Notation.StandardNotation)
+        threshold_validator.setLocale(QLocale.c())
+        self.threshold_edit.setValidator(threshold_validator)
         self.color_by_combo = QComboBox()
         self.color_by_combo.addItems(['None', 'Rarity', 'Set', 'WUBRG Colors', 'Card Type'])
         self.color_by_combo.setToolTip('Choose chart coloring')
@@ -127,11 +156,11 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         grid.addWidget(self.export_check, 10, 0, 1, 2)
         for widget in (self.weighted_check, self.group_check, self.preset_combo, self.threshold_edit, self.color_by_combo):
             if isinstance(widget, QCheckBox):
-                widget.stateChanged.connect(self.redraw_chart)
+                widget.stateChanged.connect(self.redraw_chart, Qt.ConnectionType.DirectConnection)
             elif isinstance(widget, QComboBox):
-                widget.currentTextChanged.connect(self.redraw_chart)
+                widget.currentTextChanged.connect(self.redraw_chart, Qt.ConnectionType.DirectConnection)
             elif isinstance(widget, QLineEdit):
-                widget.textChanged.connect(self.redraw_chart)
+                widget.textChanged.connect(self.redraw_chart, Qt.ConnectionType.DirectConnection)
         layout.addLayout(grid)
         layout.addStretch()
         self.run_button = QPushButton('Run Analysis')
@@ -176,9 +205,8 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         self.canvas.setSizePolicy(self.canvas.sizePolicy().horizontalPolicy(), self.canvas.sizePolicy().verticalPolicy())
         self.canvas.updateGeometry()
         self.ax = self.canvas.figure.subplots()
-        self.ax.tick_params(colors='white')
-        for spine in self.ax.spines.values():
-            spine.set_color('white')
+        self.canvas.figure.subplots_adjust(left=0.08, right=0.98, top=0.9, bottom=0.15)
+        self._style_axes()
         self.toolbar = NavigationToolbar(self.canvas, self)
         self.toolbar.setObjectName('qt_toolbar_navigation')
         self.toolbar_layout = QHBoxLayout()
@@ -211,16 +239,11 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             reply = QMessageBox.question(self, 'Unusual Set Codes', f"These set codes don't look typical: {', '.join(invalid_codes)}\n\nMost set codes are 3-4 characters (e.g., 'mh3', 'ltr').\n\nDo you want to continue anyway?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.No:
                 return
-        try:
-            threshold = float(self.threshold_edit.text())
-            if threshold < 1:
-                QMessageBox.warning(self, 'Invalid Threshold', 'Minimum group total must be at least 1.')
-                self.threshold_edit.setFocus()
-                return
-        except ValueError:
-            QMessageBox.warning(self, 'Invalid Number', 'Please enter a valid number for the minimum group total.')
+        if not self.threshold_edit.hasAcceptableInput():
+            QMessageBox.warning(self, 'Invalid Threshold', 'Minimum group total must be a number of at least 1.')
             self.threshold_edit.setFocus()
             return
+        threshold = float(self.threshold_edit.text())
         owned_cards = None
         if self.subtract_owned_check.isChecked():
             if not self.sorter_tab.all_cards:
@@ -248,6 +271,13 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         self.cancel_button.setVisible(True)
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
+        self._last_progress_emit = -1
+        self.last_analysis_data = None
+        self.last_analysis_cards = []
+        self._wubrg_cache = None
+        self._card_type_cache = None
+        self._multi_chart_source = None
+        self._last_render_key = None
         self.results_summary.setVisible(False)
         set_codes = self.options['set_codes']
         if len(set_codes) == 1:
@@ -273,7 +303,12 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
 
     def on_analysis_progress(self, current: int, total: int):
         if total > 0:
-            self.progress_bar.setRange(0, total)
+            percent = current * 100 // total
+            if percent == self._last_progress_emit and current != total:
+                return
+            self._last_progress_emit = percent
+            if self.progress_bar.maximum() != total:
+                self.progress_bar.setRange(0, total)
             self.progress_bar.setValue(current)
             self.progress_updated.emit(current)
 
@@ -337,9 +372,14 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         self.results_summary.setText(summary_text)
         self.results_summary.setVisible(True)
         self._reset_ui_state()
+        groups = result['sorted_groups']
+        result['_labels'] = [item[0] for item in groups]
+        result['_totals_raw'] = [item[1]['total_raw'] for item in groups]
+        result['_totals_weighted'] = [item[1]['total_weighted'] for item in groups]
+        result['_totals'] = result['_totals_weighted' if result['weighted'] else '_totals_raw']
         self.last_analysis_data = result
         self.last_analysis_cards = result.get('raw_cards', [])
-        self.redraw_chart()
+        self._do_redraw_chart()
         if (export_path := self.analysis_worker.options.get('export_path')):
             self._export_results(export_path, result)
         self.operation_finished.emit()
@@ -364,84 +404,65 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
                 QMessageBox.information(self, 'Export Info', 'No data to export.')
                 return
             if self.color_by_combo.currentText() == 'WUBRG Colors' and hasattr(self, 'last_analysis_cards') and self.last_analysis_cards:
-                self._export_wubrg_to_csv(export_path, result)
+                self._start_export(WubrgExportWorker(export_path, self.last_analysis_cards, self._extract_letter_grouping_from_data(result)))
             else:
-                weighted = result['weighted']
-                flat_results = [(group, data['total_weighted' if weighted else 'total_raw']) for group, data in result['sorted_groups']]
-                with open(export_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Letter Group', 'Count'])
-                    writer.writerows(flat_results)
-            QMessageBox.information(self, 'Export Successful', f'Analysis results exported to:\n{export_path}')
+                self._start_export(AnalysisExportWorker(export_path, result['_labels'], result['_totals']))
         except PermissionError:
             QMessageBox.critical(self, 'Export Failed', f"Cannot write to '{export_path}'.\n\nThe file may be open in another program or you may not have write permissions.")
         except Exception as e:
             QMessageBox.critical(self, 'Export Error', f'Failed to export results:\n\n{str(e)}')
 
-    def _export_wubrg_to_csv(self, filepath: str, result: dict):
-        try:
-            wubrg_colors = {'W': {'name': 'White', 'color': '#f0f0f0'}, 'U': {'name': 'Blue', 'color': '#007acc'}, 'B': {'name': 'Black', 'color': '#808080'}, 'R': {'name': 'Red', 'color': '#cc0000'}, 'G': {'name': 'Green', 'color': '#00cc66'}}
-            letter_mapping = self._extract_letter_grouping_from_data(result)
-            single_color_groups: dict = {color: [] for color in wubrg_colors.keys()}
-            multicolor_cards = []
-            colorless_cards = []
-            land_cards = []
-            for card_data in self.last_analysis_cards:
-                color_identity = card_data.get('colorIdentity', [])
-                card_type = card_data.get('type', '').lower()
-                if 'land' in card_type:
-                    land_cards.append(card_data)
-                elif not color_identity:
-                    colorless_cards.append(card_data)
-                elif len(color_identity) == 1:
-                    single_color_groups[color_identity[0]].append(card_data)
-                else:
-                    multicolor_cards.append(card_data)
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Color Category', 'Color Hex', 'Letter', 'Count', 'Percentage'])
-                all_categories = []
-                for color_code, color_info in wubrg_colors.items():
-                    if single_color_groups[color_code]:
-                        all_categories.append((color_info['name'], color_info['color'], single_color_groups[color_code]))
-                if multicolor_cards:
-                    all_categories.append(('Multicolor', '#ff6600', multicolor_cards))
-                if colorless_cards:
-                    all_categories.append(('Colorless', '#9a9a9a', colorless_cards))
-                if land_cards:
-                    all_categories.append(('Lands', '#8b4513', land_cards))
-                for category_name, color_hex, cards in all_categories:
-                    letter_counts = {}
-                    for card_data in cards:
-                        card_name = card_data.get('name', '')
-                        if not card_name:
-                            continue
-                        first_letter = card_name[0].upper()
-                        grouped_letter = letter_mapping.get(first_letter, first_letter)
-                        if grouped_letter not in letter_counts:
-                            letter_counts[grouped_letter] = 0
-                        letter_counts[grouped_letter] += 1
-                    sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)
-                    total_cards = sum((count for _, count in sorted_letters))
-                    for letter, count in sorted_letters:
-                        percentage = count / total_cards * 100 if total_cards > 0 else 0
-                        writer.writerow([category_name, color_hex, letter, count, f'{percentage:.1f}%'])
-        except Exception as e:
-            QMessageBox.critical(self, 'WUBRG Export Error', f'Failed to export WUBRG results:\n\n{str(e)}')
+    def _start_export(self, export_worker):
+        self.worker_manager.cleanup_worker('export')
+        export_thread = QThread()
+        export_worker.moveToThread(export_thread)
+        export_thread.started.connect(export_worker.process)
+        export_worker.finished.connect(self._on_export_finished)
+        export_worker.error.connect(self._on_export_error)
+        export_worker.finished.connect(export_thread.quit)
+        export_worker.error.connect(export_thread.quit)
+        export_thread.finished.connect(lambda t=export_thread: self.worker_manager.remove_worker('export', t))
+        export_thread.finished.connect(export_worker.deleteLater)
+        export_thread.finished.connect(export_thread.deleteLater)
+        self.worker_manager.add_worker('export', export_thread, export_worker)
+        export_thread.start()
+
+    def _on_export_finished(self, export_path: str):
+        QMessageBox.information(self, 'Export Successful', f'Analysis results exported to:\n{export_path}')
+
+    def _on_export_error(self, title: str, message: str):
+        QMessageBox.critical(self, title, message)
+
+    def redraw_chart(self, *_):
+        self._redraw_timer.start()
 
-    def redraw_chart(self, force_recreate=False):
+    def _do_redraw_chart(self, force_recreate=False):
         if self.last_analysis_data is None:
             return
         if not self.ax:
             return
+        render_key = (self.color_by_combo.currentText(), self.group_check.isChecked(), self.threshold_edit.text(), self.weighted_check.isChecked(), self.preset_combo.currentText(), id(self.last_analysis_data))
+        if render_key == self._last_render_key and (not force_recreate):
+            return
+        self._last_render_key = render_key
         data = self.last_analysis_data
         color_mode = self.color_by_combo.currentText()
-        labels = [item[0] for item in data['sorted_groups']] if data['sorted_groups'] else []
-        current_chart_key = (tuple(labels), color_mode, data.get('weighted', False))
+        labels = data['_labels']
+        if color_mode in ('WUBRG Colors', 'Card Type') and (not force_recreate):
+            source = self._multi_chart_source
+            if source is not None and source[0] == color_mode and source[1] is data:
+                return
+        self._multi_chart_source = None
+        current_chart_key = (len(labels), color_mode, data.get('weighted', False), tuple(data.get('set_codes', ())))
         need_recreate = force_recreate or not hasattr(self, '_last_chart_key') or self._last_chart_key != current_chart_key or (color_mode == 'WUBRG Colors')
         if need_recreate:
             self._last_chart_key = current_chart_key
-            self.ax.clear()
+            self._chart_labels = labels
+            if self.ax in self.canvas.figure.axes:
+                self.ax.clear()
+            else:
+                self.canvas.figure.clear()
+                self.ax = self.canvas.figure.subplots()
             for attr in ['_chart_bars', '_chart_texts', '_rarity_bars', '_set_bars', '_set_texts', '_multiset_bars']:
                 if hasattr(self, attr):
                     delattr(self, attr)
@@ -459,9 +480,11 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             return
         if color_mode == 'WUBRG Colors':
             self._create_wubrg_charts(data)
+            self._multi_chart_source = (color_mode, data)
             return
         elif color_mode == 'Card Type':
             self._create_card_type_charts(data)
+            self._multi_chart_source = (color_mode, data)
             return
         elif color_mode == 'None':
             self._update_simple_chart(data, labels, need_recreate)
@@ -469,6 +492,10 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             self._create_set_colored_chart(data, labels, need_recreate)
         else:
             self._update_rarity_chart(data, labels, need_recreate)
+        if labels != self._chart_labels:
+            self._chart_labels = labels
+            self.ax.set_xticks(range(len(labels)))
+            self.ax.set_xticklabels(labels, ha='right' if len(labels) > 10 else 'center')
         set_codes = data.get('set_codes', [data.get('set_code', '')])
         if len(set_codes) == 1:
             title = f'Card Distribution for Set: {set_codes[0].upper()}'
@@ -481,91 +508,86 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         if data['weighted']:
             ylabel = f"Weighted Score ({self.options.get('preset', 'default')} preset)"
         self.ax.set_ylabel(ylabel, color='white')
+        if need_recreate:
+            self._style_axes()
+            if len(labels) > 10:
+                self.ax.tick_params(axis='x', rotation=45)
+                for label in self.ax.get_xticklabels():
+                    label.set_ha('right')
+                self.canvas.figure.subplots_adjust(bottom=0.2)
+        layout_sig = (tuple(labels), title, ylabel)
+        if need_recreate or layout_sig != self._last_layout_sig:
+            self._last_layout_sig = layout_sig
+            self.canvas.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def _style_axes(self):
         self.ax.tick_params(colors='white')
         for spine in self.ax.spines.values():
             spine.set_color('white')
-        if len(labels) > 10:
-            self.ax.tick_params(axis='x', rotation=45)
-            for label in self.ax.get_xticklabels():
-                label.set_ha('right')
-            self.canvas.figure.subplots_adjust(bottom=0.2)
-        self.canvas.figure.tight_layout()
-        self.canvas.draw_idle()
+
+    def _label_bars(self, bars, values, old_texts=()):
+        labels = [str(int(v)) if v > 0 else '' for v in values]
+        if len(old_texts) == len(labels):
+            for text, bar, label in zip(old_texts, bars, labels):
+                text.xy = (bar.get_x() + bar.get_width() / 2, bar.get_y() + bar.get_height())
+                text.set_text(label)
+            return old_texts
+        for text in old_texts:
+            text.remove()
+        return self.ax.bar_label(bars, labels=labels, padding=2, color='white', fontsize=8)
 
     def _update_simple_chart(self, data, labels, need_recreate):
-        values = [item[1]['total_weighted' if data['weighted'] else 'total_raw'] for item in data['sorted_groups']]
+        values = data['_totals']
         if need_recreate or not hasattr(self, '_chart_bars'):
             self._chart_bars = self.ax.bar(labels, values, color='#007acc')
-            self._chart_texts = []
-            for bar, value in zip(self._chart_bars, values):
-                if value > 0:
-                    text = self.ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(values) * 0.01, str(int(value)), ha='center', va='bottom', color='white', fontsize=8)
-                    self._chart_texts.append(text)
+            self._chart_texts = self._label_bars(self._chart_bars, values)
         else:
-            max_val = max(values) if values else 1
             for bar, value in zip(self._chart_bars, values):
                 bar.set_height(value)
-            text_idx = 0
-            for bar, value in zip(self._chart_bars, values):
-                if value > 0:
-                    if text_idx < len(self._chart_texts):
-                        text = self._chart_texts[text_idx]
-                        text.set_position((bar.get_x() + bar.get_width() / 2, bar.get_height() + max_val * 0.01))
-                        text.set_text(str(int(value)))
-                        text_idx += 1
+            self._chart_texts = self._label_bars(self._chart_bars, values, self._chart_texts)
             self.ax.relim()
             self.ax.autoscale_view()
 
+    def _rarity_matrix(self, data):
+        vals = data.get('_rarity_matrix')
+        if vals is None:
+            import numpy as np
+            groups = data['sorted_groups']
+            vals = data['_rarity_matrix'] = np.array([[item[1]['rarity'].get(rarity, 0) for item in groups] for rarity in sorted(self.RARITY_COLORS)], dtype=np.float64)
+        return vals
+
     def _update_rarity_chart(self, data, labels, need_recreate):
-        all_rarities = sorted(list(self.RARITY_COLORS.keys()))
+        import numpy as np
+        all_rarities = sorted(self.RARITY_COLORS)
+        vals = self._rarity_matrix(data)
+        bottoms = np.vstack([np.zeros(vals.shape[1]), np.cumsum(vals, axis=0)[:-1]])
         if need_recreate or not hasattr(self, '_rarity_bars'):
-            bottoms = {label: 0 for label in labels}
             self._rarity_bars = {}
-            for rarity in all_rarities:
-                values = [item[1]['rarity'].get(rarity, 0) for item in data['sorted_groups']]
-                bars = self.ax.bar(labels, values, bottom=[bottoms[label] for label in labels], color=self.RARITY_COLORS.get(rarity, '#ffffff'), label=rarity.title())
-                self._rarity_bars[rarity] = bars
-                for i, label in enumerate(labels):
-                    bottoms[label] += values[i]
+            for i, rarity in enumerate(all_rarities):
+                self._rarity_bars[rarity] = self.ax.bar(labels, vals[i], bottom=bottoms[i], color=self.RARITY_COLORS.get(rarity, '#ffffff'), label=rarity.title())
             self.ax.legend(labelcolor='white', facecolor='#3c3f41', edgecolor='#555', loc='upper right')
         else:
-            bottoms = {label: 0 for label in labels}
-            for rarity in all_rarities:
-                values = [item[1]['rarity'].get(rarity, 0) for item in data['sorted_groups']]
+            for i, rarity in enumerate(all_rarities):
                 bars = self._rarity_bars.get(rarity)
                 if bars:
-                    bottom_list = [bottoms[label] for label in labels]
-                    for bar, value, bottom in zip(bars, values, bottom_list):
+                    for bar, value, bottom in zip(bars, vals[i], bottoms[i]):
                         bar.set_height(value)
                         bar.set_y(bottom)
-                    for i, label in enumerate(labels):
-                        bottoms[label] += values[i]
             self.ax.relim()
             self.ax.autoscale_view()
 
     def _create_set_colored_chart(self, data, labels, need_recreate=True):
         set_codes = data.get('set_codes', [])
         if len(set_codes) <= 1:
-            values = [item[1]['total_weighted' if data['weighted'] else 'total_raw'] for item in data['sorted_groups']]
+            values = data['_totals']
             if need_recreate or not hasattr(self, '_set_bars'):
                 self._set_bars = self.ax.bar(labels, values, color=self.SET_COLORS[0])
-                self._set_texts = []
-                for bar, value in zip(self._set_bars, values):
-                    if value > 0:
-                        text = self.ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(values) * 0.01, str(int(value)), ha='center', va='bottom', color='white', fontsize=8)
-                        self._set_texts.append(text)
+                self._set_texts = self._label_bars(self._set_bars, values)
             else:
-                max_val = max(values) if values else 1
                 for bar, value in zip(self._set_bars, values):
                     bar.set_height(value)
-                text_idx = 0
-                for bar, value in zip(self._set_bars, values):
-                    if value > 0:
-                        if text_idx < len(self._set_texts):
-                            text = self._set_texts[text_idx]
-                            text.set_position((bar.get_x() + bar.get_width() / 2, bar.get_height() + max_val * 0.01))
-                            text.set_text(str(int(value)))
-                            text_idx += 1
+                self._set_texts = self._label_bars(self._set_bars, values, self._set_texts)
                 self.ax.relim()
                 self.ax.autoscale_view()
             return
@@ -607,21 +629,22 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             self.ax.autoscale_view()
 
     def _extract_letter_grouping_from_data(self, data):
-        letter_mapping = {}
+        letter_mapping = data.get('_letter_mapping')
+        if letter_mapping is not None:
+            return letter_mapping
+        letter_mapping = data['_letter_mapping'] = {}
         if not data.get('sorted_groups'):
             return letter_mapping
         for group_name, group_data in data['sorted_groups']:
-            if group_name.startswith('(') and group_name.endswith(')'):
-                letters = group_name[1:-1]
-                for letter in letters:
-                    letter_mapping[letter] = group_name
+            if not group_name:
+                continue
+            if group_name[0] == '(' and group_name[-1] == ')':
+                letter_mapping.update(dict.fromkeys(group_name[1:-1], group_name))
             elif group_name.startswith('Group ') and '(' in group_name:
                 letters = group_name.split('(')[1].rstrip(')')
-                for letter in letters:
-                    letter_mapping[letter] = group_name
-            elif len(group_name) > 1 and all((c.isalpha() for c in group_name)):
-                for letter in group_name:
-                    letter_mapping[letter] = group_name
+                letter_mapping.update(dict.fromkeys(letters, group_name))
+            elif len(group_name) > 1 and group_name.isalpha():
+                letter_mapping.update(dict.fromkeys(group_name, group_name))
             else:
                 letter_mapping[group_name] = group_name
         return letter_mapping
@@ -629,22 +652,17 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
     def _create_wubrg_charts(self, data):
         self._create_wubrg_charts_impl(data)
 
-    def _create_wubrg_charts_impl(self, data):
-        wubrg_colors = {'W': {'name': 'White', 'color': '#f0f0f0'}, 'U': {'name': 'Blue', 'color': '#007acc'}, 'B': {'name': 'Black', 'color': '#808080'}, 'R': {'name': 'Red', 'color': '#cc0000'}, 'G': {'name': 'Green', 'color': '#00cc66'}}
-        self.ax.clear()
-        if not hasattr(self, 'last_analysis_cards') or not self.last_analysis_cards:
-            self.ax.text(0.5, 0.5, 'WUBRG analysis requires card data.\nPlease re-run the analysis.', ha='center', va='center', color='white', fontsize=14, weight='bold', transform=self.ax.transAxes)
-            self.canvas.draw_idle()
-            return
-        letter_mapping = self._extract_letter_grouping_from_data(data)
-        single_color_groups = {color: [] for color in wubrg_colors.keys()}
+    def _classify_wubrg_cards(self):
+        cards = self.last_analysis_cards
+        if self._wubrg_cache is not None and self._wubrg_cache[0] is cards:
+            return self._wubrg_cache[1]
+        single_color_groups = {color: [] for color in self.WUBRG_COLORS.keys()}
         multicolor_cards = []
         colorless_cards = []
         land_cards = []
-        for card_data in self.last_analysis_cards:
+        for card_data in cards:
             color_identity = card_data.get('colorIdentity', [])
-            card_type = card_data.get('type', '').lower()
-            if 'land' in card_type:
+            if card_data['is_land']:
                 land_cards.append(card_data)
             elif not color_identity:
                 colorless_cards.append(card_data)
@@ -652,10 +670,22 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
                 single_color_groups[color_identity[0]].append(card_data)
             else:
                 multicolor_cards.append(card_data)
+        groups = (single_color_groups, multicolor_cards, colorless_cards, land_cards)
+        self._wubrg_cache = (cards, groups)
+        return groups
+
+    def _create_wubrg_charts_impl(self, data):
+        self.ax.clear()
+        if not hasattr(self, 'last_analysis_cards') or not self.last_analysis_cards:
+            self.ax.text(0.5, 0.5, 'WUBRG analysis requires card data.\nPlease re-run the analysis.', ha='center', va='center', color='white', fontsize=14, weight='bold', transform=self.ax.transAxes)
+            self.canvas.draw_idle()
+            return
+        letter_mapping = self._extract_letter_grouping_from_data(data)
+        single_color_groups, multicolor_cards, colorless_cards, land_cards = self._classify_wubrg_cards()
         fig = self.canvas.figure
         fig.clear()
         charts_to_create = []
-        for color_code, color_info in wubrg_colors.items():
+        for color_code, color_info in self.WUBRG_COLORS.items():
             if single_color_groups[color_code]:
                 charts_to_create.append(('single', color_code, color_info, single_color_groups[color_code]))
         if multicolor_cards:
@@ -684,55 +714,20 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             row = i // cols
             col = i % cols
             ax = fig.add_subplot(gs[row, col])
-            letter_counts = {}
-            for card_data in cards:
-                card_name = card_data.get('name', '')
-                if not card_name:
-                    continue
-                first_letter = card_name[0].upper()
-                grouped_letter = letter_mapping.get(first_letter, first_letter)
-                if grouped_letter not in letter_counts:
-                    letter_counts[grouped_letter] = 0
-                letter_counts[grouped_letter] += 1
+            letter_counts = self._count_first_letters(cards, letter_mapping)
             if not letter_counts:
                 ax.text(0.5, 0.5, f"No valid {color_info['name']} card names", ha='center', va='center', color='white', fontsize=11, weight='bold', transform=ax.transAxes)
                 ax.set_title(f"{color_info['name']} Cards", color='white', fontsize=14, pad=10, weight='bold')
                 ax.set_facecolor('#2b2b2b')
                 continue
-            sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)
+            sorted_letters = letter_counts.most_common()
             letters, counts = zip(*sorted_letters)
             bars = ax.bar(letters, counts, color=color_info['color'])
-            for bar, count in zip(bars, counts):
-                if count > 0:
-                    ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(counts) * 0.01, str(count), ha='center', va='bottom', color='white', fontsize=10, weight='bold')
+            ax.bar_label(bars, labels=[str(count) if count > 0 else '' for count in counts], padding=2, color='white', fontsize=10, weight='bold')
             ax.set_title(f"{color_info['name']} ({len(cards)})", color='white', fontsize=14, pad=10, weight='bold')
             ax.set_ylabel('Count', color='white', fontsize=11, weight='bold')
             ax.set_facecolor('#2b2b2b')
-            ax.tick_params(axis='y', labelsize=10, colors='white')
-            for label in ax.get_yticklabels():
-                label.set_fontweight('bold')
-            if len(letters) > 15:
-                ax.tick_params(axis='x', rotation=45, labelsize=9, colors='white', pad=3)
-                for label in ax.get_xticklabels():
-                    label.set_ha('right')
-                    label.set_va('top')
-                    label.set_fontweight('bold')
-            elif len(letters) > 10:
-                ax.tick_params(axis='x', rotation=45, labelsize=10, colors='white', pad=3)
-                for label in ax.get_xticklabels():
-                    label.set_ha('right')
-                    label.set_va('top')
-                    label.set_fontweight('bold')
-            elif len(letters) > 6:
-                ax.tick_params(axis='x', rotation=45, labelsize=11, colors='white', pad=3)
-                for label in ax.get_xticklabels():
-                    label.set_ha('right')
-                    label.set_va('top')
-                    label.set_fontweight('bold')
-            else:
-                ax.tick_params(colors='white', labelsize=11)
-                for label in ax.get_xticklabels():
-                    label.set_fontweight('bold')
+            self._style_letter_ticks(ax, len(letters))
             for spine in ax.spines.values():
                 spine.set_color('white')
                 spine.set_linewidth(1.5)
@@ -762,47 +757,23 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             if not export_dir:
                 return
             letter_mapping = self._extract_letter_grouping_from_data(result)
-            wubrg_colors = {'W': {'name': 'White', 'color': '#f0f0f0'}, 'U': {'name': 'Blue', 'color': '#007acc'}, 'B': {'name': 'Black', 'color': '#808080'}, 'R': {'name': 'Red', 'color': '#cc0000'}, 'G': {'name': 'Green', 'color': '#00cc66'}}
-            single_color_groups: dict = {color: [] for color in wubrg_colors.keys()}
-            multicolor_cards = []
-            colorless_cards = []
-            land_cards = []
-            for card_data in self.last_analysis_cards:
-                color_identity = card_data.get('colorIdentity', [])
-                card_type = card_data.get('type', '').lower()
-                if 'land' in card_type:
-                    land_cards.append(card_data)
-                elif not color_identity:
-                    colorless_cards.append(card_data)
-                elif len(color_identity) == 1:
-                    single_color_groups[color_identity[0]].append(card_data)
-                else:
-                    multicolor_cards.append(card_data)
+            card_totals, letter_counts = tally_wubrg_letters(self.last_analysis_cards, letter_mapping)
             exported_files = []
-            for color_code, color_info in wubrg_colors.items():
-                if single_color_groups[color_code]:
-                    filename = f"{base_filename}_{color_info['name'].lower()}.csv"
-                    filepath = f'{export_dir}/{filename}'
-                    self._export_color_breakdown(filepath, single_color_groups[color_code], color_info['name'], color_info['color'], letter_mapping)
-                    exported_files.append(filename)
-            if multicolor_cards:
-                filename = f'{base_filename}_multicolor.csv'
-                filepath = f'{export_dir}/{filename}'
-                self._export_color_breakdown(filepath, multicolor_cards, 'Multicolor', '#ff6600', letter_mapping)
-                exported_files.append(filename)
-            if colorless_cards:
-                filename = f'{base_filename}_colorless.csv'
-                filepath = f'{export_dir}/{filename}'
-                self._export_color_breakdown(filepath, colorless_cards, 'Colorless', '#9a9a9a', letter_mapping)
-                exported_files.append(filename)
-            if land_cards:
-                filename = f'{base_filename}_lands.csv'
-                filepath = f'{export_dir}/{filename}'
-                self._export_color_breakdown(filepath, land_cards, 'Lands', '#8b4513', letter_mapping)
+            summary_rows = []
+            for key, (category_name, color_hex) in WUBRG_CATEGORIES.items():
+                if not card_totals[key]:
+                    continue
+                counts = letter_counts[key]
+                filename = f'{base_filename}_{category_name.lower()}.csv'
+                self._write_color_breakdown(f'{export_dir}/{filename}', counts, category_name, color_hex)
                 exported_files.append(filename)
+                top_letters = ', '.join([f'{letter}({count})' for letter, count in counts.most_common(3)])
+                summary_rows.append((category_name, color_hex, card_totals[key], len(counts), top_letters))
             summary_filename = f'{base_filename}_summary.csv'
-            summary_filepath = f'{export_dir}/{summary_filename}'
-            self._export_wubrg_summary(summary_filepath, {**{color_info['name']: single_color_groups[color_code] for color_code, color_info in wubrg_colors.items() if single_color_groups[color_code]}, **({'Multicolor': multicolor_cards} if multicolor_cards else {}), **({'Colorless': colorless_cards} if colorless_cards else {}), **({'Lands': land_cards} if land_cards else {})}, letter_mapping)
+            with open(f'{export_dir}/{summary_filename}', 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(['Category', 'Color Hex', 'Total Cards', 'Letter Count', 'Top Letters'])
+                writer.writerows(summary_rows)
             exported_files.append(summary_filename)
             if exported_files:
                 QMessageBox.information(self, 'WUBRG Export Successful', f'WUBRG analysis exported to {len(exported_files)} files:\n\n' + '\n'.join(exported_files) + f'\n\nLocation: {export_dir}')
@@ -814,66 +785,51 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
     def _export_color_breakdown(self, filepath, cards, color_name, color_hex, letter_mapping=None):
         if letter_mapping is None:
             letter_mapping = {}
-        letter_counts = {}
-        for card_data in cards:
-            card_name = card_data.get('name', '')
-            if not card_name:
-                continue
-            first_letter = card_name[0].upper()
-            grouped_letter = letter_mapping.get(first_letter, first_letter)
-            if grouped_letter not in letter_counts:
-                letter_counts[grouped_letter] = 0
-            letter_counts[grouped_letter] += 1
-        sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        letter_counts = self._count_first_letters(cards, letter_mapping)
+        self._write_color_breakdown(filepath, letter_counts, color_name, color_hex)
+
+    def _count_first_letters(self, cards, letter_mapping):
+        first_letters = (card_data.get('name', '')[:1].upper() for card_data in cards)
+        return collections.Counter((letter_mapping.get(letter, letter) for letter in first_letters if letter))
+
+    def _write_color_breakdown(self, filepath, letter_counts, color_name, color_hex):
+        total_cards = sum(letter_counts.values())
+        with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(['Color Category', 'Color Hex', 'Letter', 'Count', 'Percentage'])
-            total_cards = sum((count for _, count in sorted_letters))
-            for letter, count in sorted_letters:
-                percentage = count / total_cards * 100 if total_cards > 0 else 0
-                writer.writerow([color_name, color_hex, letter, count, f'{percentage:.1f}%'])
+            writer.writerows(((color_name, color_hex, letter, count, f'{count / total_cards * 100:.1f}%') for letter, count in letter_counts.most_common()))
 
-    def _export_wubrg_summary(self, filepath, all_categories, letter_mapping=None):
-        if letter_mapping is None:
-            letter_mapping = {}
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Category', 'Color Hex', 'Total Cards', 'Letter Count', 'Top Letters'])
-            for category_name, cards in all_categories.items():
-                if not cards:
-                    continue
-                color_hex = {'White': '#f0f0f0', 'Blue': '#007acc', 'Black': '#808080', 'Red': '#cc0000', 'Green': '#00cc66', 'Multicolor': '#ff6600', 'Colorless': '#9a9a9a', 'Lands': '#8b4513'}.get(category_name, '#000000')
-                letter_counts = {}
-                for card_data in cards:
-                    card_name = card_data.get('name', '')
-                    if not card_name:
-                        continue
-                    first_letter = card_name[0].upper()
-                    grouped_letter = letter_mapping.get(first_letter, first_letter)
-                    if grouped_letter not in letter_counts:
-                        letter_counts[grouped_letter] = 0
-                    letter_counts[grouped_letter] += 1
-                sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)
-                top_letters = ', '.join([f'{letter}({count})' for letter, count in sorted_letters[:3]])
-                writer.writerow([category_name, color_hex, len(cards), len(letter_counts), top_letters])
+    def _style_letter_ticks(self, ax, letter_count):
+        from matplotlib.artist import setp
+        ax.tick_params(axis='y', labelsize=10, colors='white')
+        setp(ax.get_yticklabels(), fontweight='bold')
+        for threshold, labelsize in self.LETTER_TICK_SIZES:
+            if letter_count > threshold:
+                ax.tick_params(axis='x', rotation=45, labelsize=labelsize, colors='white', pad=3)
+                setp(ax.get_xticklabels(), ha='right', va='top', fontweight='bold')
+                return
+        ax.tick_params(colors='white', labelsize=11)
+        setp(ax.get_xticklabels(), fontweight='bold')
 
     def _create_card_type_charts(self, data):
-        type_categories = {'Creature': {'keywords': ['creature'], 'color': '#00cc66'}, 'Instant': {'keywords': ['instant'], 'color': '#007acc'}, 'Sorcery': {'keywords': ['sorcery'], 'color': '#cc0000'}, 'Enchantment': {'keywords': ['enchantment'], 'color': '#9370db'}, 'Artifact': {'keywords': ['artifact'], 'color': '#808080'}, 'Planeswalker': {'keywords': ['planeswalker'], 'color': '#ff6600'}, 'Battle': {'keywords': ['battle'], 'color': '#cc00cc'}, 'Land': {'keywords': ['land'], 'color': '#8b4513'}}
+        type_categories = self.TYPE_CATEGORIES
         self.ax.clear()
         if not hasattr(self, 'last_analysis_cards') or not self.last_analysis_cards:
             self.ax.text(0.5, 0.5, 'Card type analysis requires card data.\nPlease re-run the analysis.', ha='center', va='center', color='white', fontsize=14, weight='bold', transform=self.ax.transAxes)
             self.canvas.draw_idle()
             return
         letter_mapping = self._extract_letter_grouping_from_data(data)
-        type_groups = {type_name: [] for type_name in type_categories.keys()}
-        for card_data in self.last_analysis_cards:
-            card_type = card_data.get('type', '').lower()
-            categorized = False
-            for type_name, type_info in type_categories.items():
-                if any((keyword in card_type for keyword in type_info['keywords'])):
-                    type_groups[type_name].append(card_data)
-                    categorized = True
-                    break
+        if self._card_type_cache is not None and self._card_type_cache[0] is self.last_analysis_cards:
+            type_groups = self._card_type_cache[1]
+        else:
+            type_groups = {type_name: [] for type_name in type_categories.keys()}
+            for card_data in self.last_analysis_cards:
+                card_type = card_data['type']
+                for type_name, type_info in type_categories.items():
+                    if any((keyword in card_type for keyword in type_info['keywords'])):
+                        type_groups[type_name].append(card_data)
+                        break
+            self._card_type_cache = (self.last_analysis_cards, type_groups)
         fig = self.canvas.figure
         fig.clear()
         charts_to_create = []
@@ -900,55 +856,20 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             row = i // cols
             col = i % cols
             ax = fig.add_subplot(gs[row, col])
-            letter_counts = {}
-            for card_data in cards:
-                card_name = card_data.get('name', '')
-                if not card_name:
-                    continue
-                first_letter = card_name[0].upper()
-                grouped_letter = letter_mapping.get(first_letter, first_letter)
-                if grouped_letter not in letter_counts:
-                    letter_counts[grouped_letter] = 0
-                letter_counts[grouped_letter] += 1
+            letter_counts = self._count_first_letters(cards, letter_mapping)
             if not letter_counts:
                 ax.text(0.5, 0.5, f'No valid {type_name} card names', ha='center', va='center', color='white', fontsize=11, weight='bold', transform=ax.transAxes)
                 ax.set_title(f'{type_name} Cards', color='white', fontsize=14, pad=10, weight='bold')
                 ax.set_facecolor('#2b2b2b')
                 continue
-            sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)
+            sorted_letters = letter_counts.most_common()
             letters, counts = zip(*sorted_letters)
             bars = ax.bar(letters, counts, color=type_info['color'])
-            for bar, count in zip(bars, counts):
-                if count > 0:
-                    ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max(counts) * 0.01, str(count), ha='center', va='bottom', color='white', fontsize=10, weight='bold')
+            ax.bar_label(bars, labels=[str(count) if count > 0 else '' for count in counts], padding=2, color='white', fontsize=10, weight='bold')
             ax.set_title(f'{type_name} ({len(cards)})', color='white', fontsize=14, pad=10, weight='bold')
             ax.set_ylabel('Count', color='white', fontsize=11, weight='bold')
             ax.set_facecolor('#2b2b2b')
-            ax.tick_params(axis='y', labelsize=10, colors='white')
-            for label in ax.get_yticklabels():
-                label.set_fontweight('bold')
-            if len(letters) > 15:
-                ax.tick_params(axis='x', rotation=45, labelsize=9, colors='white', pad=3)
-                for label in ax.get_xticklabels():
-                    label.set_ha('right')
-                    label.set_va('top')
-                    label.set_fontweight('bold')
-            elif len(letters) > 10:
-                ax.tick_params(axis='x', rotation=45, labelsize=10, colors='white', pad=3)
-                for label in ax.get_xticklabels():
-                    label.set_ha('right')
-                    label.set_va('top')
-                    label.set_fontweight('bold')
-            elif len(letters) > 6:
-                ax.tick_params(axis='x', rotation=45, labelsize=11, colors='white', pad=3)
-                for label in ax.get_xticklabels():
-                    label.set_ha('right')
-                    label.set_va('top')
-                    label.set_fontweight('bold')
-            else:
-                ax.tick_params(colors='white', labelsize=11)
-                for label in ax.get_xticklabels():
-                    label.set_fontweight('bold')
+            self._style_letter_ticks(ax, len(letters))
             for spine in ax.spines.values():
                 spine.set_color('white')
                 spine.set_linewidth(1.5)
@@ -968,24 +889,9 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
         if hasattr(self, '_wubrg_button_widget') and self._wubrg_button_widget:
             self._wubrg_button_widget.deleteLater()
             self._wubrg_button_widget = None
-        wubrg_colors = {'W': {'name': 'White', 'color': '#f0f0f0'}, 'U': {'name': 'Blue', 'color': '#007acc'}, 'B': {'name': 'Black', 'color': '#808080'}, 'R': {'name': 'Red', 'color': '#cc0000'}, 'G': {'name': 'Green', 'color': '#00cc66'}}
-        single_color_groups = {color: [] for color in wubrg_colors.keys()}
-        multicolor_cards = []
-        colorless_cards = []
-        land_cards = []
-        for card_data in self.last_analysis_cards:
-            color_identity = card_data.get('colorIdentity', [])
-            card_type = card_data.get('type', '').lower()
-            if 'land' in card_type:
-                land_cards.append(card_data)
-            elif not color_identity:
-                colorless_cards.append(card_data)
-            elif len(color_identity) == 1:
-                single_color_groups[color_identity[0]].append(card_data)
-            else:
-                multicolor_cards.append(card_data)
+        single_color_groups, multicolor_cards, colorless_cards, land_cards = self._classify_wubrg_cards()
         button_layout = QHBoxLayout()
-        for color_code, color_info in wubrg_colors.items():
+        for color_code, color_info in self.WUBRG_COLORS.items():
             if single_color_groups[color_code]:
                 button = QPushButton(f"Export {color_info['name']}")
                 button.setObjectName('wubrg_export_button')
@@ -1128,7 +1034,6 @@ class SetAnalyzerTab(QWidget, StatusAwareMixin):
             self.canvas.updateGeometry()
             if self.last_analysis_data:
                 if not hasattr(self, '_resize_timer'):
-                    from PyQt6.QtCore import QTimer
                     self._resize_timer = QTimer()
                     self._resize_timer.setSingleShot(True)
                     self._resize_timer.timeout.connect(self._handle_resize_redraw)
@@ -1,10 +1,9 @@
-import collections
-import string
 from typing import List, TYPE_CHECKING
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QAbstractItemView, QGroupBox, QHBoxLayout, QHeaderView, QLabel, QMessageBox, QPushButton, QSplitter, QTreeWidgetItem, QTreeWidgetItemIterator, QVBoxLayout, QWidget
 from core.decorators import safe_ui_method
 from core.models import Card, SortGroup
+from core.sorter_planner import SorterPlanner
 from ui.custom_widgets import NavigableTreeWidget
 if TYPE_CHECKING:
     from ui.sorter_tab import ManaBoxSorterTab
@@ -16,11 +15,15 @@ class SetSorterView(QWidget):
         self.cards_to_sort = cards_to_sort
         self.set_name = set_name
         self.parent_tab = parent_tab
+        self._planner = SorterPlanner()
         self._is_generating = False
         self._is_destroyed = False
         self._in_item_click = False
         self.canvas = None
         self.ax = None
+        self._chart_key = None
+        self._chart_bars = None
+        self._chart_texts = []
         self._setup_ui()
         QTimer.singleShot(200, self._initial_setup)
 
@@ -286,74 +289,7 @@ class SetSorterView(QWidget):
             selected_items = {item.text(0) for item in self.tree.selectedItems()}
             current_item_text = self.tree.currentItem().text(0) if self.tree.currentItem() else None
             show_sorted = self.parent_tab.show_sorted_check.isChecked()
-            piles = collections.defaultdict(lambda: {'cards': [], 'total': 0, 'unsorted': 0})
-            if self.parent_tab.optimal_grouping_check.isChecked():
-                try:
-                    threshold = int(self.parent_tab.group_threshold_edit.text())
-                except ValueError:
-                    threshold = 20
-                mapping = self._create_optimal_letter_grouping(threshold)
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        first_letter = name[0].upper()
-                        pile_key = mapping.get(first_letter, first_letter)
-                        piles[pile_key]['cards'].append(card)
-                        piles[pile_key]['total'] += card.quantity
-                        piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-            elif self.parent_tab.group_low_count_check.isChecked():
-                try:
-                    threshold = int(self.parent_tab.group_threshold_edit.text())
-                except ValueError:
-                    threshold = 20
-                raw_letter_totals = collections.defaultdict(int)
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        raw_letter_totals[name[0].upper()] += card.quantity
-                mapping = {}
-                buf, tot = ('', 0)
-
-                def flush():
-                    nonlocal buf, tot
-                    if buf:
-                        for ch in buf:
-                            mapping[ch] = buf
-                        buf, tot = ('', 0)
-                letters = string.ascii_uppercase
-                for i, l in enumerate(letters):
-                    count = raw_letter_totals.get(l, 0)
-                    if 0 < count < threshold:
-                        buf += l
-                        tot += count
-                        if tot >= threshold or not (i < 25 and raw_letter_totals.get(letters[i + 1], 0) < threshold):
-                            flush()
-                    else:
-                        flush()
-                        mapping[l] = l
-                flush()
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        first_letter = name[0].upper()
-                        pile_key = mapping.get(first_letter, first_letter)
-                        piles[pile_key]['cards'].append(card)
-                        piles[pile_key]['total'] += card.quantity
-                        piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-            else:
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        pile_key = name[0].upper()
-                        piles[pile_key]['cards'].append(card)
-                        piles[pile_key]['total'] += card.quantity
-                        piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-            nodes = []
-            for name, pile_data in piles.items():
-                node = SortGroup(group_name=name, count=pile_data['unsorted'], cards=pile_data['cards'])
-                node.total_count = pile_data['total']
-                node.unsorted_count = pile_data['unsorted']
-                nodes.append(node)
+            nodes = self._build_pile_nodes()
             if show_sorted:
                 display_nodes = sorted(nodes, key=lambda x: x.total_count, reverse=True)
                 chart_title = f'Card Distribution in {self.set_name} (Total Cards)'
@@ -401,17 +337,35 @@ class SetSorterView(QWidget):
         if not self.ax or not self.canvas or self._is_destroyed:
             return
         try:
+            chart_labels = [node.group_name for node in display_nodes]
+            chart_counts = [node.total_count if show_sorted else node.unsorted_count for node in display_nodes]
+            chart_key = (tuple(chart_labels), chart_title)
+            if display_nodes and chart_key == self._chart_key and self._chart_bars is not None:
+                for bar, text, node, count in zip(self._chart_bars, self._chart_texts, display_nodes, chart_counts):
+                    bar.set_height(count)
+                    if show_sorted:
+                        bar.set_color('#555555' if node.unsorted_count <= 0 else '#007acc')
+                    text.set_position((bar.get_x() + bar.get_width() / 2.0, count))
+                    text.set_text(f'{int(count)}')
+                    text.set_visible(count > 0)
+                self.ax.relim()
+                self.ax.autoscale_view()
+                self.canvas.draw_idle()
+                return
+            self._chart_key = chart_key
+            self._chart_bars = None
+            self._chart_texts = []
             self.ax.clear()
             if not display_nodes:
                 self.ax.text(0.5, 0.5, 'Set Complete! All cards sorted.', ha='center', va='center', color='white', fontsize=16)
             else:
-                chart_labels = [node.group_name for node in display_nodes]
-                chart_counts = [node.total_count if show_sorted else node.unsorted_count for node in display_nodes]
                 colors = ['#555555' if node.unsorted_count <= 0 else '#007acc' for node in display_nodes] if show_sorted else '#007acc'
                 bars = self.ax.bar(chart_labels, chart_counts, color=colors, zorder=3)
                 for bar, count in zip(bars, chart_counts):
-                    if (height := bar.get_height()) > 0:
-                        self.ax.text(bar.get_x() + bar.get_width() / 2.0, height, f'{int(count)}', ha='center', va='bottom', color='white', fontsize=8)
+                    text = self.ax.text(bar.get_x() + bar.get_width() / 2.0, bar.get_height(), f'{int(count)}', ha='center', va='bottom', color='white', fontsize=8)
+                    text.set_visible(count > 0)
+                    self._chart_texts.append(text)
+                self._chart_bars = bars
                 self.ax.set_title(chart_title, color='white')
                 self.ax.set_ylabel('Card Count', color='white')
                 self.ax.tick_params(axis='x', colors='white', rotation=45 if len(chart_labels) > 10 else 0)
@@ -420,7 +374,7 @@ class SetSorterView(QWidget):
                     spine.set_color('white')
                 self.ax.grid(axis='y', color='#444444', linestyle='--', linewidth=0.5, zorder=0)
             self.canvas.figure.tight_layout()
-            self.canvas.draw()
+            self.canvas.draw_idle()
         except Exception as e:
             print(f'Error drawing chart: {e}')
 
@@ -429,68 +383,7 @@ class SetSorterView(QWidget):
             return
         try:
             show_sorted = self.parent_tab.show_sorted_check.isChecked()
-            piles = collections.defaultdict(lambda: {'cards': [], 'total': 0, 'unsorted': 0})
-            if self.parent_tab.optimal_grouping_check.isChecked():
-                threshold = int(self.parent_tab.group_threshold_edit.text()) if self.parent_tab.group_threshold_edit.text() else 20
-                mapping = self._create_optimal_letter_grouping(threshold)
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        first_letter = name[0].upper()
-                        pile_key = mapping.get(first_letter, first_letter)
-                        piles[pile_key]['cards'].append(card)
-                        piles[pile_key]['total'] += card.quantity
-                        piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-            elif self.parent_tab.group_low_count_check.isChecked():
-                threshold = int(self.parent_tab.group_threshold_edit.text()) if self.parent_tab.group_threshold_edit.text() else 20
-                raw_letter_totals = collections.defaultdict(int)
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        raw_letter_totals[name[0].upper()] += card.quantity
-                mapping = {}
-                buf, tot = ('', 0)
-
-                def flush():
-                    nonlocal buf, tot
-                    if buf:
-                        for ch in buf:
-                            mapping[ch] = buf
-                        buf, tot = ('', 0)
-                letters = string.ascii_uppercase
-                for i, l in enumerate(letters):
-                    count = raw_letter_totals.get(l, 0)
-                    if 0 < count < threshold:
-                        buf += l
-                        tot += count
-                        if tot >= threshold or not (i < 25 and raw_letter_totals.get(letters[i + 1], 0) < threshold):
-                            flush()
-                    else:
-                        flush()
-                        mapping[l] = l
-                flush()
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        first_letter = name[0].upper()
-                        pile_key = mapping.get(first_letter, first_letter)
-                        piles[pile_key]['cards'].append(card)
-                        piles[pile_key]['total'] += card.quantity
-                        piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-            else:
-                for card in self.cards_to_sort:
-                    name = getattr(card, 'name', '')
-                    if name and name != 'N/A':
-                        pile_key = name[0].upper()
-                        piles[pile_key]['cards'].append(card)
-                        piles[pile_key]['total'] += card.quantity
-                        piles[pile_key]['unsorted'] += card.quantity - card.sorted_count
-            nodes = []
-            for name, pile_data in piles.items():
-                node = SortGroup(group_name=name, count=pile_data['unsorted'], cards=pile_data['cards'])
-                node.total_count = pile_data['total']
-                node.unsorted_count = pile_data['unsorted']
-                nodes.append(node)
+            nodes = self._build_pile_nodes()
             if show_sorted:
                 display_nodes = sorted(nodes, key=lambda x: x.total_count, reverse=True)
                 chart_title = f'Card Distribution in {self.set_name} (Total Cards)'
@@ -501,51 +394,10 @@ class SetSorterView(QWidget):
         except Exception as e:
             print(f'Error refreshing chart: {e}')
 
-    def _create_optimal_letter_grouping(self, threshold):
-        import string
-        raw_letter_totals = collections.defaultdict(int)
-        for card in self.cards_to_sort:
-            name = getattr(card, 'name', '')
-            if name and name != 'N/A':
-                raw_letter_totals[name[0].upper()] += card.quantity
-        letter_counts = [(letter, raw_letter_totals.get(letter, 0)) for letter in string.ascii_uppercase]
-        letter_counts.sort(key=lambda x: x[1], reverse=True)
-        high_letters = [(l, c) for l, c in letter_counts if c >= threshold]
-        low_letters = [(l, c) for l, c in letter_counts if 0 < c < threshold]
-        mapping = {}
-        for letter, count in high_letters:
-            mapping[letter] = letter
-        if low_letters:
-            groups = self._optimal_bin_packing(low_letters, threshold)
-            for group in groups:
-                group_name = ''.join(sorted([letter for letter, _ in group]))
-                for letter, _ in group:
-                    mapping[letter] = group_name
-        for letter in string.ascii_uppercase:
-            if letter not in mapping:
-                mapping[letter] = letter
-        return mapping
-
-    def _optimal_bin_packing(self, items, capacity):
-        if not items:
-            return []
-        items = sorted(items, key=lambda x: x[1], reverse=True)
-        bins = []
-        for item in items:
-            letter, count = item
-            best_bin = None
-            best_remaining_space = float('inf')
-            for bin_items in bins:
-                if len(bin_items) >= 3:
-                    continue
-                current_sum = sum((c for _, c in bin_items))
-                if current_sum + count <= capacity:
-                    remaining_space = capacity - (current_sum + count)
-                    if remaining_space < best_remaining_space:
-                        best_remaining_space = remaining_space
-                        best_bin = bin_items
-            if best_bin is not None:
-                best_bin.append(item)
-            else:
-                bins.append([item])
-        return bins
\ No newline at end of file
+    def _build_pile_nodes(self) -> List[SortGroup]:
+        try:
+            threshold = int(self.parent_tab.group_threshold_edit.text())
+        except ValueError:
+            threshold = 20
+        nodes, _ = self._planner.create_set_letter_plan(self.cards_to_sort, self.set_name, group_low_count=self.parent_tab.group_low_count_check.isChecked(), optimal_grouping=self.parent_tab.optimal_grouping_check.isChecked(), threshold=threshold)
+        return nodes
\ No newline at end of file
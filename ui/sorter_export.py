@@ -19,26 +19,30 @@ class SorterExport:
         if not filepath:
             return
         try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            columns = range(current_tree.columnCount())
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
                 writer = csv.writer(f)
-                writer.writerow([current_tree.headerItem().text(i) for i in range(current_tree.columnCount())])
-                iterator = QTreeWidgetItemIterator(current_tree)
-                while iterator.value():
-                    item = iterator.value()
-                    if not item.isHidden():
-                        writer.writerow([item.text(i) for i in range(current_tree.columnCount())])
-                    iterator += 1
+                writer.writerow([current_tree.headerItem().text(i) for i in columns])
+                writer.writerows(([item.text(i) for i in columns] for item in self._iter_visible_items(current_tree)))
             QMessageBox.information(self.parent, 'Export Success', f'Successfully exported to:\n{filepath}')
         except Exception as e:
             self.parent.handle_file_error('exporting file', e, additional_context=f"filepath: {filepath}, tree_items: {(current_tree.topLevelItemCount() if current_tree else 'None')}")
             QMessageBox.critical(self.parent, 'Export Error', f'Failed to export file: {e}')
 
+    @staticmethod
+    def _iter_visible_items(tree):
+        iterator = QTreeWidgetItemIterator(tree)
+        while (item := iterator.value()):
+            if not item.isHidden():
+                yield item
+            iterator += 1
+
     def get_save_data(self) -> dict:
         if not self.parent.all_cards:
             return {}
         progress = {c.scryfall_id: c.sorted_count for c in self.parent.all_cards if c.sorted_count > 0}
         sort_criteria = self.parent._get_sort_order_safely()
-        cards_as_dicts = [c.__dict__ for c in self.parent.all_cards]
+        cards_as_dicts = [c.to_dict() for c in self.parent.all_cards]
         return {'metadata': {'version': '1.1', 'app': 'MTGToolkit'}, 'collection': cards_as_dicts, 'progress': progress, 'settings': {'sort_criteria': sort_criteria, 'group_low_count': self.parent.group_low_count_check.isChecked(), 'optimal_grouping': self.parent.optimal_grouping_check.isChecked(), 'group_threshold': self.parent.group_threshold_edit.text()}}
 
     def save_to_project(self, filepath: str, is_auto_save: bool=False) -> bool:
@@ -1,6 +1,6 @@
 import pathlib
 from typing import List
-from PyQt6.QtCore import QSettings, QThread, QTimer
+from PyQt6.QtCore import QSettings, QSignalBlocker, QThread, QTimer
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from api.mtgjson_api import MTGJsonAPI
 from core.constants import Config
@@ -157,7 +157,8 @@ class SorterImport:
         self.parent.clear_layout(self.parent.breadcrumb_layout)
         self.parent._show_empty_state()
         self.parent.reset_preview_pane()
-        self.parent.filter_edit.clear()
+        with QSignalBlocker(self.parent.filter_edit):
+            self.parent.filter_edit.clear()
         self.parent.filter_edit.setVisible(False)
         self.parent.preview_panel.setVisible(False)
         self.parent.update_button_visibility()
@@ -1,6 +1,6 @@
 import collections
 from typing import List
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QSignalBlocker, QTimer, Qt
 from PyQt6.QtWidgets import QAbstractItemView, QHBoxLayout, QHeaderView, QLabel, QPushButton, QTreeWidgetItem
 from core.models import Card, SortGroup
 from ui.custom_widgets import NavigableTreeWidget
@@ -39,7 +39,8 @@ class SorterNavigation:
                     item.widget().deleteLater()
             if self.parent.results_stack.count() > level:
                 self.parent.results_stack.setCurrentIndex(level)
-            self.parent.filter_edit.clear()
+            with QSignalBlocker(self.parent.filter_edit):
+                self.parent.filter_edit.clear()
             self.parent.filter_current_view('')
             self.parent.update_button_visibility()
         except Exception as e:
@@ -136,24 +137,24 @@ class SorterNavigation:
 
     def _get_nested_value(self, card: Card, key: str) -> str:
         if key == 'First Letter':
-            name = getattr(card, 'name', '')
+            name = card.name
             return name[0].upper() if name and name != 'N/A' else '#'
         if key == 'Set':
-            return getattr(card, 'set_name', 'N/A') or 'N/A'
+            return card.set_name or 'N/A'
         if key == 'Rarity':
-            rarity = getattr(card, 'rarity', 'N/A') or 'N/A'
+            rarity = card.rarity or 'N/A'
             return rarity.capitalize()
         if key == 'Type Line':
-            type_line = getattr(card, 'type_line', 'N/A') or 'N/A'
+            type_line = card.type_line or 'N/A'
             return type_line.split('//')[0].strip()
         if key == 'Condition':
-            condition = getattr(card, 'condition', 'N/A') or 'N/A'
+            condition = card.condition or 'N/A'
             return condition.capitalize()
         if key == 'Color Identity':
-            ci = getattr(card, 'color_identity', [])
+            ci = card.color_identity
             return ''.join(sorted(ci)) or 'Colorless'
         if key == 'Commander Staple':
-            rank = getattr(card, 'edhrec_rank', None)
+            rank = card.edhrec_rank
             return 'Staple (Top 1000)' if rank and rank <= 1000 else 'Not a Staple'
         return 'N/A'
 
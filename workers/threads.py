@@ -1,5 +1,8 @@
+import collections
 import csv
 import logging
+import re
+import socket
 import time
 from typing import Any, Dict, Optional
 
@@ -10,16 +13,12 @@ from api.mtgjson_api import MTGJsonAPI
 from core.booster_probability import BoosterProbabilityCalculator
 from core.card_validator import CardValidator
 from core.constants import Config
+from core.memory import get_memory_usage_mb
 from core.models import Card
 
 
-def get_memory_usage_mb():
-    try:
-        import psutil
-        process = psutil.Process()
-        return process.memory_info().rss / 1024 / 1024
-    except ImportError:
-        return None
+_CSV_SPECIAL = re.compile('[,"\r\n]')
+WUBRG_CATEGORIES = {'W': ('White', '#f0f0f0'), 'U': ('Blue', '#007acc'), 'B': ('Black', '#808080'), 'R': ('Red', '#cc0000'), 'G': ('Green', '#00cc66'), 'multicolor': ('Multicolor', '#ff6600'), 'colorless': ('Colorless', '#9a9a9a'), 'lands': ('Lands', '#8b4513')}
 
 def check_memory_safety(operation_name: str, max_mb: int=1024) -> bool:
     current_mb = get_memory_usage_mb()
@@ -49,7 +48,7 @@ class CsvImportWorker(QObject):
         if current == total:
             return True  # Always emit final update
 
-        now = time.time()
+        now = time.monotonic()
         if now - self._last_progress_time >= self._min_update_interval:
             self._last_progress_time = now
             return True
@@ -176,7 +175,7 @@ class LionsEyeImportWorker(QObject):
         if current == total:
             return True  # Always emit final update
 
-        now = time.time()
+        now = time.monotonic()
         if now - self._last_progress_time >= self._min_update_interval:
             self._last_progress_time = now
             return True
@@ -311,7 +310,7 @@ class SetAnalysisWorker(QObject):
         if current == total:
             return True  # Always emit final update
 
-        now = time.time()
+        now = time.monotonic()
         if now - self._last_progress_time >= self._min_update_interval:
             self._last_progress_time = now
             return True
@@ -346,7 +345,10 @@ class SetAnalysisWorker(QObject):
             if not all_cards:
                 self.error.emit('No cards found in any of the specified sets')
                 return
-            self.raw_cards = all_cards.copy()
+            self.raw_cards = []
+            for card in all_cards:
+                card_type = card.get('type', '').lower()
+                self.raw_cards.append({'name': card.get('name', ''), 'colorIdentity': card.get('colorIdentity', []), 'type': card_type, 'is_land': 'land' in card_type})
             self.status_update.emit(f'Analyzing {len(all_cards)} cards from {total_sets} set(s)...')
             owned_cards = self.options.get('owned_cards', [])
             owned_by_id = {}
@@ -611,6 +613,92 @@ class SetAnalysisWorker(QObject):
                     current_total = 0
         return high_count
 
+class AnalysisExportWorker(QObject):
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str, str)
+
+    def __init__(self, export_path: str, labels: list, totals: list, parent=None):
+        super().__init__(parent)
+        self.export_path = export_path
+        self.labels = labels
+        self.totals = totals
+
+    def process(self):
+        try:
+            with open(self.export_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                if any((_CSV_SPECIAL.search(label) for label in self.labels)):
+                    writer = csv.writer(f)
+                    writer.writerow(['Letter Group', 'Count'])
+                    writer.writerows(zip(self.labels, self.totals))
+                else:
+                    f.write('Letter Group,Count\r\n' + ''.join((f'{label},{total}\r\n' for label, total in zip(self.labels, self.totals))))
+            self.finished.emit(self.export_path)
+        except PermissionError:
+            self.error.emit('Export Failed', f"Cannot write to '{self.export_path}'.\n\nThe file may be open in another program or you may not have write permissions.")
+        except Exception as e:
+            self.error.emit('Export Error', f'Failed to export results:\n\n{str(e)}')
+
+def tally_wubrg_letters(cards: list, letter_mapping: dict):
+    card_totals = dict.fromkeys(WUBRG_CATEGORIES, 0)
+    letter_counts = {key: collections.Counter() for key in WUBRG_CATEGORIES}
+    for card_data in cards:
+        color_identity = card_data.get('colorIdentity') or ()
+        if card_data['is_land']:
+            key = 'lands'
+        elif not color_identity:
+            key = 'colorless'
+        elif len(color_identity) == 1:
+            key = color_identity[0]
+        else:
+            key = 'multicolor'
+        card_totals[key] += 1
+        card_name = card_data.get('name', '')
+        if card_name:
+            first_letter = card_name[0].upper()
+            letter_counts[key][letter_mapping.get(first_letter, first_letter)] += 1
+    return (card_totals, letter_counts)
+
+class WubrgExportWorker(QObject):
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str, str)
+
+    def __init__(self, export_path: str, cards: list, letter_mapping: dict, parent=None):
+        super().__init__(parent)
+        self.export_path = export_path
+        self.cards = cards
+        self.letter_mapping = letter_mapping
+
+    def process(self):
+        try:
+            _, letter_counts = tally_wubrg_letters(self.cards, self.letter_mapping)
+            rows = []
+            append = rows.append
+            for key, (category_name, color_hex) in WUBRG_CATEGORIES.items():
+                counts = letter_counts[key]
+                total_cards = sum(counts.values())
+                for letter, count in counts.most_common():
+                    append((category_name, color_hex, letter, count, f'{count / total_cards * 100:.1f}%'))
+            with open(self.export_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(['Color Category', 'Color Hex', 'Letter', 'Count', 'Percentage'])
+                writer.writerows(rows)
+            self.finished.emit(self.export_path)
+        except PermissionError:
+            self.error.emit('Export Failed', f"Cannot write to '{self.export_path}'.\n\nThe file may be open in another program or you may not have write permissions.")
+        except Exception as e:
+            self.error.emit('WUBRG Export Error', f'Failed to export WUBRG results:\n\n{str(e)}')
+
+class NetworkCheckWorker(QObject):
+    finished = pyqtSignal(list)
+
+    def run(self):
+        issues = []
+        try:
+            socket.create_connection(('api.scryfall.com', 443), timeout=2).close()
+        except OSError:
+            issues.append('Could not connect to Scryfall API. Check your internet connection.')
+        self.finished.emit(issues)
+
 class WorkerManager:
 
     def __init__(self):
@@ -619,8 +707,9 @@ class WorkerManager:
     def add_worker(self, name: str, thread: QThread, worker: QObject):
         self.workers[name] = (thread, worker)
 
-    def remove_worker(self, name: str):
-        if name in self.workers:
+    def remove_worker(self, name: str, thread: QThread | None=None):
+        entry = self.workers.get(name)
+        if entry is not None and (thread is None or entry[0] is thread):
             del self.workers[name]
 
     def cleanup_worker(self, name: str):